@@ -0,0 +1,143 @@
+# Rollup analitik per cabang dari riwayat status (tabel shipment_events).
+# Rollup diperbarui inkremental: setiap refresh hanya membaca event baru (id > watermark),
+# bukan scan ulang seluruh shipments. State disimpan di proses (satu instance lewat
+# st.cache_resource); setelah proses start ulang, event dibaca ulang sekali.
+
+import threading
+import time
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import repository
+import status_model
+from perf import percentile
+
+REFRESH_INTERVAL = 10   # detik minimal antar pembacaan event
+LOOKBACK = 200          # id terakhir dibaca ulang: transaksi paralel bisa commit dengan id lebih kecil
+DAYS_KEPT = 14          # hari per_day yang disimpan = jendela grafik dashboard
+LEAD_SAMPLE = 5000      # lead time terbaru yang disimpan untuk p50/p90
+WIB = timezone(timedelta(hours=7))
+NEW_CODE = status_model.STATUS_CODES["Menunggu Konfirmasi"]
+
+def parse_ts(v):
+    """Waktu event -> datetime WIB tanpa zona (format last_updated); None bila kosong/rusak."""
+    if not v: return None
+    try: dt = datetime.fromisoformat(str(v))
+    except ValueError: return None
+    return dt.astimezone(WIB).replace(tzinfo=None) if dt.tzinfo else dt
+
+def wib_now():
+    return datetime.utcnow() + timedelta(hours=7)
+
+
+class BranchRollup:
+    """Rollup satu cabang: order per hari, lead time selesai, dan order yang masih terbuka."""
+
+    def __init__(self):
+        self.per_day = Counter()     # tanggal -> jumlah order baru
+        self.open = {}               # order_id -> [dibuat, masuk_konfirmasi]
+        self.leads = array("d")      # jam Menunggu Konfirmasi -> Selesai/Diterima (maks LEAD_SAMPLE terbaru)
+        self.completed = 0           # total order selesai yang punya lead time, termasuk yang sudah keluar sampel
+        self._sorted = None
+
+    def sorted_leads(self):
+        if self._sorted is None: self._sorted = sorted(self.leads)
+        return self._sorted
+
+    def prune(self, today):
+        """Buang hari di luar jendela grafik dan lead time di luar sampel, agar memori tidak terus tumbuh."""
+        first = today - timedelta(days=DAYS_KEPT - 1)
+        for d in [d for d in self.per_day if d < first]: del self.per_day[d]
+        if len(self.leads) > LEAD_SAMPLE:
+            del self.leads[:len(self.leads) - LEAD_SAMPLE]
+            self._sorted = None
+
+    def apply(self, ev, ts):
+        oid = ev["order_id"]
+        if ev["kind"] in ("delete", "archive"):
+            self.open.pop(oid, None)
+            return
+        if ev["kind"] == "create":
+            if ts: self.per_day[ts.date()] += 1
+            state = self.open.setdefault(oid, [ts, None])
+        else:
+            state = self.open.get(oid)
+            if state is None:
+                # Order dibuka lagi setelah selesai (koreksi status): mulai hitung dari event ini
+                if ev["status_category"] != status_model.DONE: self.open[oid] = [ts, ts if ev["status_code"] == NEW_CODE else None]
+                return
+        if ev["status_code"] == NEW_CODE and state[1] is None: state[1] = ts
+        if ev["status_category"] == status_model.DONE:
+            del self.open[oid]
+            if state[1] and ts:
+                self.completed += 1
+                self.leads.append(max(0.0, (ts - state[1]).total_seconds() / 3600))
+                self._sorted = None
+
+
+class Rollups:
+    """Rollup semua cabang + watermark event yang sudah diproses."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.branches = {}
+        self.last_id = 0
+        self.events = 0
+        self._recent = set()         # id dalam jendela LOOKBACK, supaya event tidak dihitung dua kali
+        self._last_refresh = 0.0
+
+    def refresh(self, repo, force=False):
+        """Baca event baru dari ``repo.events_since``; kembalikan jumlah event yang diproses."""
+        with self._lock:
+            if not force and time.monotonic() - self._last_refresh < REFRESH_INTERVAL: return 0
+            n, after = 0, max(0, self.last_id - LOOKBACK)
+            while True:
+                rows = repo.events_since(after, repository.EVENT_PAGE_SIZE)
+                for ev in rows:
+                    if ev["id"] in self._recent: continue
+                    self._recent.add(ev["id"])
+                    self.branches.setdefault(ev["branch"] or "-", BranchRollup()).apply(ev, parse_ts(ev["event_at"]))
+                    self.last_id = max(self.last_id, ev["id"])
+                    n += 1
+                if len(rows) < repository.EVENT_PAGE_SIZE: break
+                after = rows[-1]["id"]
+            today = wib_now().date()
+            for b in self.branches.values(): b.prune(today)
+            floor = self.last_id - LOOKBACK
+            self._recent = {i for i in self._recent if i > floor}
+            self.events += n
+            self._last_refresh = time.monotonic()
+            return n
+
+    def snapshot(self, branch=None, days=DAYS_KEPT, now=None):
+        """Ringkasan satu cabang (atau semua bila ``branch`` None) untuk tampilan dashboard.
+
+        ``days`` paling banyak ``DAYS_KEPT``; p50/p90 lead time dihitung dari ``LEAD_SAMPLE`` order selesai terakhir.
+        """
+        now = now or wib_now()
+        with self._lock:
+            parts = [self.branches[branch]] if branch in self.branches else [] if branch else list(self.branches.values())
+            per_day, leads, ages, completed = Counter(), [], [], 0
+            for b in parts:
+                completed += b.completed
+                per_day.update(b.per_day)
+                leads.extend(b.sorted_leads())
+                ages.extend((now - c).total_seconds() / 3600 for c, _ in b.open.values() if c)
+        if len(parts) > 1: leads.sort()
+        ages.sort()
+        first = now.date() - timedelta(days=days - 1)
+        return {
+            "orders_per_day": [(first + timedelta(days=i), per_day.get(first + timedelta(days=i), 0)) for i in range(days)],
+            "orders_today": per_day.get(now.date(), 0),
+            "completed": completed,
+            "lead_p50_h": percentile(leads, 50) if leads else None,
+            "lead_p90_h": percentile(leads, 90) if leads else None,
+            "backlog": len(ages),
+            "backlog_p50_h": percentile(ages, 50) if ages else None,
+            "backlog_max_h": ages[-1] if ages else None,
+        }
+
+    def by_branch(self, now=None):
+        with self._lock: names = sorted(self.branches)
+        return {b: self.snapshot(b, days=1, now=now) for b in names}
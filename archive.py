@@ -0,0 +1,38 @@
+# Job arsip: pindahkan order yang selesai lebih dari N hari ke shipments_archive, per batch.
+# Tiap batch satu transaksi (repo.archive_batch), jadi job aman dihentikan di tengah jalan.
+# Dipanggil dari Manajemen Data > Arsip (Admin) atau terjadwal lewat CLI:
+#
+#   python archive.py --days 90                       # Supabase (SUPABASE_URL / SUPABASE_KEY)
+#   DELIVERY_BACKEND=sqlite DELIVERY_SQLITE_PATH=delivery.db python archive.py --days 30
+
+import argparse
+from datetime import datetime, timedelta
+
+import repository
+
+ARCHIVE_AFTER_DAYS = 90
+MAX_BATCHES = 200   # batas satu kali jalan (200 x 500 = 100rb order)
+
+def cutoff_for(days, now=None):
+    # last_updated disimpan sebagai waktu WIB tanpa zona
+    now = now or datetime.utcnow() + timedelta(hours=7)
+    return (now - timedelta(days=days)).isoformat(timespec="seconds")
+
+def run(repo, days=ARCHIVE_AFTER_DAYS, batch_size=repository.ARCHIVE_BATCH, max_batches=MAX_BATCHES, now=None, progress=None):
+    """Arsipkan order selesai dengan ``last_updated`` lebih lama dari ``days`` hari; kembalikan jumlah order."""
+    cutoff, moved = cutoff_for(days, now), 0
+    for _ in range(max_batches):
+        n = repo.archive_batch(cutoff, batch_size)
+        moved += n
+        if progress: progress(moved)
+        if n < batch_size: break
+    return moved
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Pindahkan order selesai lama ke shipments_archive.")
+    ap.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS)
+    ap.add_argument("--batch", type=int, default=repository.ARCHIVE_BATCH)
+    ap.add_argument("--max-batches", type=int, default=MAX_BATCHES)
+    args = ap.parse_args()
+    n = run(repository.from_env(), args.days, args.batch, args.max_batches, progress=lambda m: print(f"{m} order diarsipkan..."))
+    print(f"Selesai: {n} order dipindah ke arsip.")
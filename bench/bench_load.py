@@ -0,0 +1,277 @@
+"""Uji beban sesi staf bersamaan: N pengguna simulasi menjalankan alur halaman asli lewat AppTest.
+
+Semua pengguna berjalan sebagai thread di satu proses, berbagi repository, cache & outbox
+seperti satu deployment Streamlit (backend SQLite berisi data sintetis, tanpa Supabase).
+Tiap jumlah pengguna jalan di proses baru, jadi ``RSS`` = memori puncak untuk beban itu:
+
+    python bench/bench_load.py                                # 1, 4, 16 pengguna, 20 dtk
+    python bench/bench_load.py --users 8 32 --duration 60 --latency 30
+    python bench/bench_load.py --flows dashboard sales --json after.json
+    python bench/bench_load.py --compare before.json          # exit 1 bila p95 naik > --max-regress %
+
+Satu alur = satu sesi baru (buka aplikasi + aksi di halaman), waktunya = total semua rerun
+yang ditunggu pengguna. ``--latency`` menambah jeda per query untuk meniru round trip Supabase.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+
+from perf import percentile
+from synthetic import BRANCHES, FIRST, load_sqlite
+
+# Versi Streamlit yang internalnya ditambal share_server_state (lihat bench/requirements.txt)
+STREAMLIT_VERSION = "1.65.0"
+
+# Filter cabang di aplikasi diambil dari kredensial login
+PASSWORDS = {"admin": "a", "sales": {b: "s" for b in BRANCHES}, "spv": {b: "v" for b in BRANCHES}}
+# Alur -> (peran, bobot dalam campuran beban); cabang Sales / SPV diacak dari data sintetis
+FLOWS = {
+    "tracking": ("Guest", 4),
+    "dashboard": ("Admin", 3),
+    "sales": ("Sales", 2),
+    "update": ("Admin", 2),
+    "export": ("SPV", 1),
+}
+LABELS = {"tracking": "Cek Resi: cari order / nama", "dashboard": "Dashboard: filter cabang + bucket",
+          "sales": "Input Order: submit + PDF", "update": "Update Status: pilih + simpan",
+          "export": "Manajemen Data: export Excel"}
+
+# --- ALUR HALAMAN (DIJALANKAN DI PROSES ANAK) ---
+def flow_tracking(at, rnd, ctx):
+    at.run()
+    q = f"SO-{rnd.randrange(ctx['rows']):08d}" if rnd.random() < 0.7 else rnd.choice(FIRST)
+    at.text_input[0].input(q).run()
+    if not at.markdown: return "hasil lacak kosong"
+
+def flow_dashboard(at, rnd, ctx):
+    at.run()
+    at.selectbox[0].set_value(rnd.choice(BRANCHES)).run()
+    if not any(r.key == "dash_bucket" for r in at.radio): return "; ".join(e.value for e in at.error) or "bucket tidak tampil"
+    at.radio(key="dash_bucket").set_value(rnd.choice(["pending", "shipping", "done"])).run()
+    if len(at.metric) != 3: return "hitungan bucket tidak tampil"
+
+def flow_sales(at, rnd, ctx):
+    at.run()
+    at.sidebar.radio[0].set_value("📝 Input Delivery Order").run()
+    oid = f"LOAD-{ctx['uid']}-{next(ctx['seq'])}"
+    for key, value in [("in_id", oid), ("in_sales", "Bench"), ("in_nama", "Pelanggan Bench"), ("in_hp", "0812"),
+                       ("in_alamat", "Jl. Contoh No. 1"), ("in_barang", "Kulkas 2 Pintu")]:
+        (at.text_area if key == "in_alamat" else at.text_input)(key=key).set_value(value)
+    next(b for b in at.button if b.label == "Kirim ke Gudang").click().run()
+    if not at.session_state["sales_success"]: return at.session_state["sales_error"] or "submit gagal"
+
+def flow_update(at, rnd, ctx):
+    at.run()
+    at.sidebar.radio[0].set_value("⚙️ Update Status (Admin)").run()
+    picker = at.selectbox(key="upd_sel")
+    # Opsi tampil sebagai "[status] order_id - nama"
+    oid = rnd.choice(picker.options).split("] ", 1)[1].split(" - ", 1)[0]
+    picker.set_value(oid).run()
+    # Order baru dari sesi lain bisa menggeser order ini keluar dari halaman picker
+    if not any(w.key == f"stat_{oid}" for w in at.selectbox): return f"{oid} tidak lagi ada di halaman picker"
+    at.selectbox(key=f"stat_{oid}").set_value(rnd.choice(["Diproses Gudang", "Dalam Pengiriman", "Selesai/Diterima"]))
+    next(b for b in at.button if b.label == "Simpan Perubahan").click().run()
+    if not any("Berhasil" in s.value for s in at.success): return f"update {oid} tidak tersimpan"
+
+def flow_export(at, rnd, ctx):
+    at.run()
+    at.sidebar.radio[0].set_value("🗄️ Manajemen Data").run()
+    next(b for b in at.button if b.label == "Siapkan File Laporan").click().run()
+    exp = at.session_state["export_file"] if "export_file" in at.session_state else None
+    if not exp: return "file laporan tidak dibuat"
+    os.unlink(exp["path"])
+
+def session(app_path, flow, rnd, ctx):
+    """Satu sesi baru menjalankan satu alur; kembalikan (ms, jumlah rerun, error atau None)."""
+    from streamlit.testing.v1 import AppTest
+    role = FLOWS[flow][0]
+    at = AppTest.from_file(app_path, default_timeout=120)
+    at.session_state["user_role"] = role
+    at.session_state["user_branch"] = rnd.choice(BRANCHES) if role in ("Sales", "SPV") else ("Pusat" if role == "Admin" else "")
+    runs = [0]
+    # Rerun dari widget (set_value / click) juga lewat _run
+    orig = at._run
+    def counted_run(*args, **kw):
+        runs[0] += 1
+        return orig(*args, **kw)
+    at._run = counted_run
+    t0 = time.perf_counter()
+    try:
+        err = globals()[f"flow_{flow}"](at, rnd, ctx)
+        if at.exception: err = str(at.exception[0].value)
+    except Exception as e:
+        err = f"{type(e).__name__}: {e}"
+    return (time.perf_counter() - t0) * 1000, runs[0], err
+
+def share_server_state():
+    """Bagian AppTest yang dibuat ulang per run dijadikan satu per proses, seperti satu server Streamlit.
+
+    Menambal internal Streamlit (ScriptCache, Runtime), jadi hanya jalan dengan ``STREAMLIT_VERSION``.
+    """
+    import streamlit
+    if streamlit.__version__ != STREAMLIT_VERSION:
+        sys.exit(f"bench_load butuh streamlit=={STREAMLIT_VERSION} (terpasang {streamlit.__version__}): pip install -r bench/requirements.txt")
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    # Satu ScriptCache: app.py dikompilasi sekali (compile() paralel di Python 3.11 bisa gagal acak)
+    code, lock = {}, threading.Lock()
+    def cache_init(self): self._cache, self._lock = code, lock
+    ScriptCache.__init__ = cache_init
+    # global.appTest dipulihkan di akhir tiap run; tanpa ini format_func widget sesi lain hilang
+    config.set_option("global.appTest", True)
+    # Runtime tiruan dipasang di awal tiap run lalu dicabut; sesi paralel memakai yang pertama
+    shared = {}
+    def instance(cls):
+        if shared.get("rt") is None: shared["rt"] = cls._instance
+        if shared["rt"] is None: raise RuntimeError("Runtime hasn't been created!")
+        return shared["rt"]
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or shared.get("rt") is not None)
+
+def child(app_path, users, duration, latency, rows, flows):
+    import logging
+    import resource
+    sys.path.insert(0, os.path.dirname(os.path.abspath(app_path)))
+    import streamlit as st
+    from streamlit.runtime.secrets import Secrets
+    import repository
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    # Secrets dipasang sekali untuk semua sesi (at.secrets ditukar-pulihkan per run, tidak aman paralel)
+    st.secrets = Secrets(); st.secrets._secrets = {"passwords": PASSWORDS}
+    share_server_state()
+    if latency:
+        orig = repository.SQLiteRepository._run
+        def slow_run(self, label, sql, params=(), write=False):
+            time.sleep(latency / 1000)
+            return orig(self, label, sql, params, write)
+        repository.SQLiteRepository._run = slow_run
+
+    seq = iter(range(10**9))
+    ctx = {"rows": rows, "seq": seq, "uid": "w"}
+    # Pemanasan: import modul, cache_resource & snapshot feed tidak ikut terukur
+    warm_errors = {}
+    for f in flows:
+        _, _, err = session(app_path, f, random.Random(0), ctx)
+        if err: warm_errors[f] = err
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    out = []
+    deadline = time.monotonic() + duration
+    weights = [FLOWS[f][1] for f in flows]
+    def user(uid):
+        rnd = random.Random(uid)
+        uctx = dict(ctx, uid=uid)
+        while time.monotonic() < deadline:
+            f = rnd.choices(flows, weights)[0]
+            ms, runs, err = session(app_path, f, rnd, uctx)
+            out.append((f, ms, runs, err))
+    threads = [threading.Thread(target=user, args=(i,)) for i in range(users)]
+    t0 = time.perf_counter()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    wall = time.perf_counter() - t0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    per_flow = {}
+    for f in flows:
+        done = [(ms, runs, err) for g, ms, runs, err in out if g == f]
+        ms = sorted(m for m, _, e in done if not e)
+        errs = [e for _, _, e in done if e]
+        per_flow[f] = {"n": len(done), "errors": len(errs), "first_error": errs[0] if errs else None,
+                       "p50_ms": round(percentile(ms, 50)) if ms else None, "p95_ms": round(percentile(ms, 95)) if ms else None,
+                       "p99_ms": round(percentile(ms, 99)) if ms else None, "reruns": sum(r for _, r, _ in done)}
+    print(json.dumps({"users": users, "wall_s": round(wall, 1), "flows": len(out),
+                      "flows_per_s": round(len(out) / wall, 2), "reruns_per_s": round(sum(r for _, _, r, _ in out) / wall, 1),
+                      "rss_mb": round(rss / 1024), "rss_warm_mb": round(base_rss / 1024),
+                      "warmup_errors": warm_errors, "per_flow": per_flow}))
+
+# --- PROSES INDUK ---
+def seed(path, n):
+    import repository
+    repo = repository.SQLiteRepository(path)
+    load_sqlite(repo, n)
+    repo.conn.close()
+
+def run(app_path, users_list, duration, latency, rows, flows):
+    tmp = tempfile.mkdtemp(prefix="bench_load_")
+    seed_path = os.path.join(tmp, "seed.db")
+    seed(seed_path, rows)
+    results = []
+    print(f"{rows:,} baris sintetis, {duration} dtk per tingkat, latency query {latency} ms")
+    try:
+        for users in users_list:
+            # Salinan baru per tingkat: submit & update tingkat sebelumnya tidak ikut terbawa
+            db_path = os.path.join(tmp, f"load_{users}.db")
+            shutil.copy(seed_path, db_path)
+            env = dict(os.environ, DELIVERY_BACKEND="sqlite", DELIVERY_SQLITE_PATH=db_path, DELIVERY_OUTBOX_PATH=":memory:")
+            cmd = [sys.executable, os.path.abspath(__file__), "--child", app_path, str(users), str(duration),
+                   str(latency), str(rows), ",".join(flows)]
+            res = subprocess.run(cmd, env=env, capture_output=True, text=True, cwd=tmp)
+            lines = [l for l in res.stdout.splitlines() if l.startswith("{")]
+            if not lines:
+                print(f"{users} pengguna: gagal\n{res.stderr[-2000:]}")
+                continue
+            r = json.loads(lines[-1])
+            results.append(r)
+            print(f"\n== {users} pengguna: {r['flows']} alur ({r['flows_per_s']}/dtk), {r['reruns_per_s']} rerun/dtk, "
+                  f"RSS puncak {r['rss_mb']} MB (setelah pemanasan {r['rss_warm_mb']} MB)")
+            print(f"{'alur':36s} {'n':>5s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'error':>6s}")
+            for f, s in r["per_flow"].items():
+                fmt = lambda v: f"{v:8d}" if v is not None else f"{'-':>8s}"
+                print(f"{LABELS[f]:36s} {s['n']:5d} {fmt(s['p50_ms'])} {fmt(s['p95_ms'])} {fmt(s['p99_ms'])} {s['errors']:6d}")
+                if s["first_error"]: print(f"   ! {s['first_error']}")
+            for f, e in r["warmup_errors"].items(): print(f"   ! pemanasan {f}: {e}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+def compare(results, baseline, max_regress):
+    """Bandingkan p95 per alur dengan hasil sebelumnya; kembalikan daftar regresi."""
+    old = {(r["users"], f): s for r in baseline for f, s in r["per_flow"].items()}
+    bad = []
+    print(f"\nDibanding baseline (batas +{max_regress}% p95):")
+    for r in results:
+        for f, s in r["per_flow"].items():
+            prev = old.get((r["users"], f))
+            if not prev or not prev["p95_ms"] or s["p95_ms"] is None: continue
+            delta = (s["p95_ms"] - prev["p95_ms"]) / prev["p95_ms"] * 100
+            flag = delta > max_regress or s["errors"] > prev["errors"]
+            if flag: bad.append((r["users"], f))
+            print(f"{r['users']:3d} pengguna {LABELS[f]:36s} {prev['p95_ms']:7d} -> {s['p95_ms']:7d} ms ({delta:+.0f}%)"
+                  + ("  ! REGRESI" if flag else ""))
+    return bad
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        a = sys.argv[2:]
+        child(a[0], int(a[1]), float(a[2]), float(a[3]), int(a[4]), a[5].split(","))
+        sys.exit(0)
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--app", default=os.path.join(os.path.dirname(ROOT), "app.py"))
+    ap.add_argument("--users", type=int, nargs="+", default=[1, 4, 16], help="jumlah pengguna bersamaan per tingkat")
+    ap.add_argument("--duration", type=float, default=20, help="detik per tingkat")
+    ap.add_argument("--latency", type=float, default=0, help="jeda per query (ms) untuk meniru Supabase")
+    ap.add_argument("--rows", type=int, default=20_000)
+    ap.add_argument("--flows", nargs="+", choices=list(FLOWS), default=list(FLOWS))
+    ap.add_argument("--json", help="simpan hasil ke file JSON")
+    ap.add_argument("--compare", help="file JSON hasil sebelumnya (--json) sebagai baseline")
+    ap.add_argument("--max-regress", type=float, default=20, help="kenaikan p95 (%%) yang dianggap regresi")
+    args = ap.parse_args()
+    res = run(os.path.abspath(args.app), args.users, args.duration, args.latency, args.rows, args.flows)
+    if args.json:
+        with open(args.json, "w") as f: json.dump(res, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f: baseline = json.load(f)
+        if compare(res, baseline, args.max_regress): sys.exit(1)
@@ -0,0 +1,107 @@
+"""Benchmark jalur data tiap halaman terhadap SQLiteRepository.
+
+Tiap skenario memanggil metode repository yang sama dengan yang dipakai halamannya
+(tanpa cache query), pada data sintetis 10 ribu / 100 ribu / 1 juta baris.
+
+    python bench/bench_pages.py                       # 10k dan 100k
+    python bench/bench_pages.py --sizes 1000000       # 1 juta baris (butuh beberapa menit)
+    python bench/bench_pages.py --db /tmp/bench.db    # simpan database di file
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import export
+import repository
+from perf import percentile
+from synthetic import BRANCHES, FIRST, load_sqlite
+
+DASH_COLS = ['order_id', 'customer_name', 'product_name', 'status', 'last_updated', 'delivery_type']
+BULK_COLS = ['order_id', 'customer_name', 'product_name', 'status', 'courier', 'branch', 'created_at']
+
+def timed(fn, repeat):
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+def scenarios(repo, n, rnd):
+    def rand_oid(): return f"SO-{rnd.randrange(n):08d}"
+    def deep_page():
+        cur = None
+        for _ in range(10): _, cur = repo.page(rnd.choice(BRANCHES), cursor=cur)
+    counter = iter(range(10**9))
+    def insert_one():
+        i = next(counter)
+        repo.insert({"order_id": f"BENCH-{n}-{i}", "customer_name": "Bench", "branch": "Jakarta",
+                     "status": "Menunggu Konfirmasi", "product_name": "TV", "sales_name": "Bench"})
+    def import_200():
+        i = next(counter)
+        repo.insert([{"order_id": f"IMP-{n}-{i}-{j}", "customer_name": "Bench", "branch": "Jakarta",
+                      "status": "Menunggu Konfirmasi", "product_name": "TV", "sales_name": "Bench"} for j in range(200)])
+    def export_csv():
+        fd, path = tempfile.mkstemp(suffix=".csv"); os.close(fd)
+        try: export.write_csv(repo.iter_export(rnd.choice(BRANCHES)), path)
+        finally: os.unlink(path)
+    heavy = 1 if n >= 500_000 else 3
+    return [
+        ("Cek Resi: order_id", lambda: repo.get(rand_oid()), 50),
+        ("Cek Resi: nama", lambda: repo.search_by_name(rnd.choice(FIRST), 10), 20),
+        ("Dashboard: 3 count + badge", lambda: [repo.count(rnd.choice(BRANCHES), b) for b in repository.BUCKETS]
+                                               + [repo.count(None, None, "Menunggu Konfirmasi")], 10),
+        ("Dashboard: bucket Diproses hal. 1", lambda: repo.list_bucket(rnd.choice(BRANCHES), "pending", DASH_COLS, limit=50), 10),
+        ("Dashboard: bucket Selesai hal. 1", lambda: repo.list_bucket(rnd.choice(BRANCHES), "done", DASH_COLS, limit=50), 20),
+        ("Dashboard: bucket Selesai hal. 20 (update)", lambda: repo.list_bucket(rnd.choice(BRANCHES), "done", DASH_COLS, sort="last_updated",
+                                                                                 offset=950, limit=50), 10),
+        ("Dashboard: cari di bucket Selesai + count", lambda: (repo.list_bucket(rnd.choice(BRANCHES), "done", DASH_COLS, rnd.choice(FIRST), limit=50),
+                                                               repo.count(rnd.choice(BRANCHES), "done", search=rnd.choice(FIRST))), 10),
+        ("Dashboard: bucket Selesai penuh (lama)", lambda: repo.list_bucket(rnd.choice(BRANCHES), "done", DASH_COLS), heavy),
+        ("Update Status: picker hal. 1", lambda: repo.page(rnd.choice(BRANCHES)), 20),
+        ("Update Status: picker hal. 10", deep_page, 5),
+        ("Update Status: cari order", lambda: repo.page(None, f"SO-{rnd.randrange(n):08d}"[:9]), 10),
+        ("Update Status: list massal", lambda: repo.list_recent(rnd.choice(BRANCHES), ["Menunggu Konfirmasi", "Diproses Gudang", "Menunggu Kurir"], BULK_COLS, 500), 10),
+        ("Update Status: update 40 order", lambda: repo.update_many([rand_oid() for _ in range(40)], {"courier": "BES"}), 10),
+        ("Input Order: insert 1", insert_one, 20),
+        ("Upload Massal: insert 200", import_200, 5),
+        ("Manajemen Data: export CSV 1 cabang", export_csv, heavy),
+        ("Manajemen Data: load semua (lama)", lambda: repo.list_recent(None), heavy),
+    ]
+
+def run(sizes, db_path=None, seed=7):
+    results = []
+    for n in sizes:
+        path = db_path or ":memory:"
+        if path != ":memory:" and os.path.exists(path): os.unlink(path)
+        repo = repository.SQLiteRepository(path)
+        t0 = time.perf_counter()
+        load_sqlite(repo, n)
+        print(f"\n== {n:,} baris (load {time.perf_counter() - t0:.1f} dtk)")
+        print(f"{'skenario':40s} {'p50 ms':>9s} {'p95 ms':>9s} {'n':>4s}")
+        rnd = random.Random(seed)
+        for name, fn, repeat in scenarios(repo, n, rnd):
+            t = sorted(timed(fn, repeat))
+            results.append({"rows": n, "scenario": name, "p50_ms": round(statistics.median(t), 2),
+                            "p95_ms": round(percentile(t, 95), 2), "repeat": repeat})
+            print(f"{name:40s} {statistics.median(t):9.2f} {percentile(t, 95):9.2f} {repeat:4d}")
+        repo.conn.close()
+    return results
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--db", help="path file SQLite (default: in-memory)")
+    ap.add_argument("--json", help="simpan hasil ke file JSON")
+    args = ap.parse_args()
+    res = run(args.sizes, args.db)
+    if args.json:
+        with open(args.json, "w") as f: json.dump(res, f, indent=2)
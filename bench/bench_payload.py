@@ -0,0 +1,114 @@
+"""Ukur byte data yang dibaca dari database per muatan halaman (backend SQLite, data sintetis).
+
+Setiap hasil query dihitung sebagai JSON (kira-kira sama dengan body respons PostgREST).
+Tiap skenario jalan di proses baru, jadi cache query selalu dingin:
+
+    python bench/bench_payload.py                               # app.py di repo ini
+    python bench/bench_payload.py --app /tmp/old/app.py         # bandingkan dengan versi lain
+    python bench/bench_payload.py --rows 50000 --json after.json
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# (nama, peran, cabang, halaman, aksi setelah halaman terbuka)
+SCENARIOS = [
+    ("Cek Resi: order_id", "Guest", "", None, "track_oid"),
+    ("Cek Resi: nama", "Guest", "", None, "track_name"),
+    ("Dashboard SPV: buka bucket Diproses", "SPV", "Jakarta", None, "bucket"),
+    ("Update Status: picker", "Admin", "Pusat", "⚙️ Update Status (Admin)", None),
+    ("Update Status: pilih 1 order", "Admin", "Pusat", "⚙️ Update Status (Admin)", "pick"),
+    ("Manajemen Data (SPV)", "SPV", "Jakarta", "🗄️ Manajemen Data", None),
+    ("Sales: cetak ulang", "Sales", "Jakarta", "📝 Input Delivery Order", "reprint"),
+]
+
+def child(app_path, idx):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(app_path)))
+    import repository
+    from streamlit.testing.v1 import AppTest
+    total = {"bytes": 0, "rows": 0, "queries": 0}
+    orig = repository.SQLiteRepository._run
+    def counting_run(self, label, sql, params=(), write=False):
+        rows = orig(self, label, sql, params, write)
+        total["bytes"] += len(json.dumps(rows, default=str).encode())
+        total["rows"] += len(rows); total["queries"] += 1
+        return rows
+    repository.SQLiteRepository._run = counting_run
+
+    def newest(branch=None):
+        # Langsung lewat sqlite3 supaya tidak ikut terhitung
+        conn = sqlite3.connect(os.environ["DELIVERY_SQLITE_PATH"])
+        sql = "select order_id from shipments" + (" where branch = ?" if branch else "") + " order by created_at desc, id desc limit 1"
+        return conn.execute(sql, (branch,) if branch else ()).fetchone()[0]
+
+    name, role, branch, page, action = SCENARIOS[idx]
+    at = AppTest.from_file(app_path, default_timeout=120)
+    at.secrets["passwords"] = {"admin": "a", "sales": {"Jakarta": "j"}, "spv": {"Jakarta": "s"}}
+    at.session_state["user_role"] = role
+    at.session_state["user_branch"] = branch
+    oid = "SO-00000123"
+    if action == "track_oid": at.query_params["oid"] = oid
+    steps = []
+    def step(fn):
+        before = dict(total); fn()
+        steps.append({k: total[k] - before[k] for k in total})
+    step(at.run)
+    # Yang diukur hanya langkah terakhir: buka halaman, atau aksi di halaman itu
+    if page: step(lambda: at.sidebar.radio[0].set_value(page).run())
+    if action == "track_name": step(lambda: at.text_input[0].input("Budi").run())
+    elif action == "bucket": step(lambda: at.radio(key="dash_bucket").set_value("pending").run())
+    elif action == "pick": step(lambda: at.selectbox(key="upd_sel").set_value(newest()).run())
+    elif action == "reprint": step(lambda: at.text_input(key="reprint_id").input(newest("Jakarta")).run())
+    out = steps[-1]
+    out["errors"] = [str(e.value) for e in at.exception]
+    print(json.dumps(out))
+
+def seed(path, n):
+    sys.path.insert(0, os.path.dirname(ROOT))
+    import repository
+    from synthetic import load_sqlite
+    repo = repository.SQLiteRepository(path)
+    load_sqlite(repo, n)
+    repo.conn.close()
+
+def run(app_path, n):
+    fd, db_path = tempfile.mkstemp(suffix=".db"); os.close(fd); os.unlink(db_path)
+    seed(db_path, n)
+    env = dict(os.environ, DELIVERY_BACKEND="sqlite", DELIVERY_SQLITE_PATH=db_path, DELIVERY_OUTBOX_PATH=":memory:")
+    results = []
+    print(f"{n:,} baris sintetis\n{'skenario':40s} {'KB':>9s} {'baris':>7s} {'query':>6s}")
+    try:
+        for i, (name, *_rest) in enumerate(SCENARIOS):
+            res = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", app_path, str(i)],
+                                 env=env, capture_output=True, text=True)
+            lines = [l for l in res.stdout.splitlines() if l.startswith("{")]
+            if not lines:
+                print(f"{name}: gagal\n{res.stderr[-2000:]}")
+                continue
+            r = dict(json.loads(lines[-1]), scenario=name)
+            results.append(r)
+            print(f"{name:40s} {r['bytes'] / 1024:9.1f} {r['rows']:7d} {r['queries']:6d}")
+            for e in r["errors"]: print(f"   ! {e}")
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix): os.unlink(db_path + suffix)
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], int(sys.argv[3]))
+        sys.exit(0)
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--app", default=os.path.join(os.path.dirname(ROOT), "app.py"))
+    ap.add_argument("--rows", type=int, default=20_000)
+    ap.add_argument("--json", help="simpan hasil ke file JSON")
+    args = ap.parse_args()
+    res = run(args.app, args.rows)
+    if args.json:
+        with open(args.json, "w") as f: json.dump(res, f, indent=2)
@@ -0,0 +1,78 @@
+"""Ukur cold start & biaya rerun app.py per peran/halaman (backend SQLite, tanpa Supabase).
+
+Tiap skenario jalan di proses Python baru, sehingga waktu import modul ikut terukur:
+
+    python bench/bench_startup.py                     # app.py di repo ini
+    python bench/bench_startup.py --app /tmp/old/app.py --json before.json
+
+Kolom: ``first`` = run pertama (import + render), ``rerun`` = run kedua di halaman yang sama,
+``switch`` = pindah ke halaman lain dari sesi yang sudah jalan, ``rss`` = tambahan memori
+puncak dibanding proses yang baru memuat streamlit, ``berat`` = modul berat yang termuat.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ["pandas", "numpy", "fpdf", "qrcode", "xlsxwriter", "PIL"]
+SCENARIOS = [
+    ("Guest", "", None),
+    ("Sales", "Jakarta", None),
+    ("Admin", "Pusat", None),
+    ("Admin", "Pusat", "⚙️ Update Status (Admin)"),
+    ("Admin", "Pusat", "🗄️ Manajemen Data"),
+    ("Sales", "Jakarta", "📝 Input Delivery Order"),
+]
+
+def child(app_path, role, branch, target):
+    import resource
+    from streamlit.testing.v1 import AppTest
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    at = AppTest.from_file(app_path, default_timeout=120)
+    at.secrets["passwords"] = {"admin": "a", "sales": {"Jakarta": "j", "Bandung": "b"}, "spv": {"Jakarta": "s"}}
+    at.session_state["user_role"] = role
+    at.session_state["user_branch"] = branch
+    out = {}
+    t0 = time.perf_counter(); at.run(); out["first_ms"] = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter(); at.run(); out["rerun_ms"] = (time.perf_counter() - t0) * 1000
+    if target:
+        t0 = time.perf_counter(); at.sidebar.radio[0].set_value(target).run(); out["switch_ms"] = (time.perf_counter() - t0) * 1000
+    out["errors"] = [str(e.value) for e in at.exception]
+    out["rss_mb"] = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss) / 1024
+    out["heavy"] = [m for m in HEAVY if m in sys.modules]
+    print(json.dumps(out))
+
+def run(app_path):
+    env = dict(os.environ, DELIVERY_BACKEND="sqlite", DELIVERY_OUTBOX_PATH=":memory:", PYTHONPATH=os.path.dirname(os.path.abspath(app_path)))
+    results = []
+    print(f"{'skenario':42s} {'first':>8s} {'rerun':>8s} {'switch':>8s} {'rss MB':>7s}  berat")
+    for role, branch, target in SCENARIOS:
+        cmd = [sys.executable, os.path.abspath(__file__), "--child", app_path, role, branch, target or ""]
+        res = subprocess.run(cmd, env=env, capture_output=True, text=True)
+        lines = [l for l in res.stdout.splitlines() if l.startswith("{")]
+        if not lines:
+            print(f"{role} {target or ''}: gagal\n{res.stderr[-2000:]}")
+            continue
+        r = dict(json.loads(lines[-1]), role=role, page=target or "(awal)")
+        results.append(r)
+        name = f"{role} {target or '(halaman awal)'}"
+        sw = f"{r['switch_ms']:8.0f}" if "switch_ms" in r else f"{'-':>8s}"
+        print(f"{name:42s} {r['first_ms']:8.0f} {r['rerun_ms']:8.0f} {sw} {r['rss_mb']:7.1f}  {','.join(r['heavy'])}")
+        for e in r["errors"]: print(f"   ! {e}")
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5] or None)
+        sys.exit(0)
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    ap.add_argument("--json", help="simpan hasil ke file JSON")
+    args = ap.parse_args()
+    res = run(args.app)
+    if args.json:
+        with open(args.json, "w") as f: json.dump(res, f, indent=2)
@@ -0,0 +1,101 @@
+"""Uji beban tracking_server.py terhadap SQLiteRepository in-memory (data sintetis).
+
+Klien paralel (koneksi keep-alive) memanggil ``/api/track?oid=...``. ``--latency`` menambah
+jeda per query untuk meniru round trip ke Supabase, supaya efek cache & penggabungan
+request (coalescing) terlihat:
+
+    python bench/bench_tracking.py
+    python bench/bench_tracking.py --latency 30 --clients 32 --requests 300
+
+Kolom ``query`` = query database yang benar-benar jalan untuk semua request skenario itu.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db
+import repository
+import tracking_server
+from perf import percentile
+from synthetic import load_sqlite
+
+class LatencyRepository(repository.SQLiteRepository):
+    """SQLiteRepository dengan jeda tetap per query (di luar lock, seperti request HTTP)."""
+
+    def __init__(self, path=":memory:", latency_ms=0):
+        super().__init__(path)
+        self.latency = latency_ms / 1000
+
+    def _run(self, label, sql, params=(), write=False):
+        if self.latency: time.sleep(self.latency)
+        return super()._run(label, sql, params, write)
+
+def client(port, oids, n, seed, out):
+    rnd = random.Random(seed)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    for _ in range(n):
+        t0 = time.perf_counter()
+        conn.request("GET", f"/api/track?oid={rnd.choice(oids)}")
+        res = conn.getresponse(); res.read()
+        out.append(((time.perf_counter() - t0) * 1000, res.status))
+    conn.close()
+
+def scenario(repo, oids, ttl, clients, requests):
+    srv = tracking_server.TrackingServer(("127.0.0.1", 0), repo, ttl=ttl)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    db.STATS.reset()
+    out = []
+    threads = [threading.Thread(target=client, args=(srv.server_port, oids, requests, i, out)) for i in range(clients)]
+    t0 = time.perf_counter()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    wall = time.perf_counter() - t0
+    srv.shutdown(); srv.server_close()
+    ms = sorted(m for m, _ in out)
+    queries = sum(s["calls"] for s in db.STATS.summary())
+    return {"rps": round(len(out) / wall), "p50_ms": round(percentile(ms, 50), 2), "p95_ms": round(percentile(ms, 95), 2),
+            "queries": queries, "requests": len(out), "errors": sum(1 for _, s in out if s >= 500),
+            "coalesced": srv.cache.coalesced}
+
+def run(rows, clients, requests, latency):
+    repo = LatencyRepository(":memory:", latency)
+    load_sqlite(repo, rows)
+    hot = [f"SO-{rows - 1:08d}"]
+    spread = [f"SO-{i:08d}" for i in random.Random(1).sample(range(rows), 2000)]
+    missing = [f"XX-{i}" for i in range(200)]
+    cases = [
+        ("1 order, semua klien (TTL 15 dtk)", hot, tracking_server.TRACK_TTL),
+        ("1 order, tanpa TTL (coalescing saja)", hot, 0),
+        ("2000 order acak (TTL 15 dtk)", spread, tracking_server.TRACK_TTL),
+        ("2000 order acak, tanpa cache", spread, 0),
+        ("order tidak ada (TTL 15 dtk)", missing, tracking_server.TRACK_TTL),
+    ]
+    print(f"{rows:,} baris, {clients} klien x {requests} request, latency query {latency} ms")
+    print(f"{'skenario':40s} {'req/s':>7s} {'p50 ms':>8s} {'p95 ms':>8s} {'query':>7s} {'gabung':>7s}")
+    results = []
+    for name, oids, ttl in cases:
+        r = dict(scenario(repo, oids, ttl, clients, requests), scenario=name)
+        results.append(r)
+        print(f"{name:40s} {r['rps']:7d} {r['p50_ms']:8.2f} {r['p95_ms']:8.2f} {r['queries']:7d} {r['coalesced']:7d}"
+              + (f"  ! {r['errors']} error" if r["errors"] else ""))
+    return results
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, default=20_000)
+    ap.add_argument("--clients", type=int, default=16)
+    ap.add_argument("--requests", type=int, default=500, help="request per klien")
+    ap.add_argument("--latency", type=float, default=0, help="jeda per query (ms) untuk meniru Supabase")
+    ap.add_argument("--json", help="simpan hasil ke file JSON")
+    args = ap.parse_args()
+    res = run(args.rows, args.clients, args.requests, args.latency)
+    if args.json:
+        with open(args.json, "w") as f: json.dump(res, f, indent=2)
@@ -0,0 +1,57 @@
+# Data shipments sintetis untuk benchmark & uji beban.
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import status_model
+
+BRANCHES = ["Jakarta", "Bandung", "Surabaya", "Medan", "Semarang", "Makassar", "Denpasar", "Palembang"]
+# Bobot mendekati kondisi nyata: mayoritas riwayat sudah selesai
+STATUSES = [("Menunggu Konfirmasi", 4), ("Diproses Gudang", 5), ("Menunggu Kurir", 3),
+            ("Dalam Pengiriman", 8), ("Selesai/Diterima", 80)]
+FIRST = ["Budi", "Siti", "Agus", "Dewi", "Rudi", "Rina", "Andi", "Wati", "Joko", "Sri", "Hendra", "Maya"]
+LAST = ["Santoso", "Wijaya", "Saputra", "Lestari", "Hidayat", "Kusuma", "Pratama", "Nugroho", "Halim"]
+PRODUCTS = ["Kulkas 2 Pintu", "Mesin Cuci", "TV LED 43\"", "AC 1 PK", "Dispenser", "Kipas Angin", "Rice Cooker"]
+
+def synthetic_rows(n, seed=42, days=730):
+    rnd = random.Random(seed)
+    names, weights = zip(*STATUSES)
+    start = datetime.now(timezone.utc) - timedelta(days=days)
+    step = timedelta(days=days) / max(n, 1)
+    for i in range(n):
+        created = start + step * i
+        tipe = rnd.choice(["Reguler", "Reguler", "Express", "Tukar Tambah"])
+        inst = rnd.choice(["Tidak", "Tidak", "Ya - Vendor"])
+        yield {
+            "created_at": created.isoformat(),
+            "order_id": f"SO-{i:08d}",
+            "customer_name": f"{rnd.choice(FIRST)} {rnd.choice(LAST)} {i % 997}",
+            "customer_phone": f"08{rnd.randrange(10**9, 10**10)}",
+            "delivery_address": f"Jl. Contoh No. {rnd.randrange(1, 300)}, RT {rnd.randrange(1, 20):02d}/RW {rnd.randrange(1, 15):02d}, Kel. Sukamaju, Kec. Sukajadi",
+            "product_name": rnd.choice(PRODUCTS),
+            "delivery_type": tipe,
+            "sales_name": rnd.choice(FIRST),
+            "sales_phone": f"08{rnd.randrange(10**9, 10**10)}",
+            "branch": rnd.choice(BRANCHES),
+            **status_model.status_fields(rnd.choices(names, weights)[0]),
+            "last_updated": (created + timedelta(hours=rnd.randrange(1, 96))).isoformat(),
+            "courier": rnd.choice([None, "BES", "JNE", "Kurir Toko"]),
+            "resi": None,
+            "installation_opt": inst,
+            "installation_fee": "50000" if inst == "Ya - Vendor" else "",
+            "old_product_name": "Unit lama" if tipe == "Tukar Tambah" else "",
+        }
+
+def load_sqlite(repo, n, seed=42, batch=20000):
+    """Isi SQLiteRepository secara cepat (executemany, tanpa lewat repo.insert)."""
+    rows = synthetic_rows(n, seed)
+    cols = None
+    with repo.lock:
+        while True:
+            chunk = [r for _, r in zip(range(batch), rows)]
+            if not chunk: break
+            cols = cols or list(chunk[0])
+            repo.conn.executemany(f"insert into shipments ({','.join(cols)}) values ({','.join('?' * len(cols))})",
+                                  [tuple(r[c] for c in cols) for r in chunk])
+        repo.conn.commit()
+        repo.conn.execute("analyze")
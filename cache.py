@@ -0,0 +1,168 @@
+# Cache baca tabel shipments, dipakai bersama oleh semua sesi dalam satu proses.
+# Instance-nya dibuat sekali per proses: lewat st.cache_resource di common.py, atau oleh tracking_server.py.
+
+import threading
+import time
+from collections import OrderedDict
+
+ALL_BRANCHES = None  # kunci cabang untuk query lintas cabang (Admin / Cek Resi)
+
+
+class _Flight:
+    """Satu pemuatan yang sedang berjalan; permintaan lain untuk kunci yang sama menunggu di sini."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class QueryCache:
+    """LRU + TTL cache untuk hasil query, dengan invalidasi per cabang.
+
+    Kunci berupa tuple ``(jenis, cabang, bucket, kata_cari, halaman)`` sehingga
+    bentuk query yang berbeda tidak saling menimpa. Permintaan bersamaan untuk kunci
+    yang belum ada digabung: hanya satu loader yang jalan, sisanya menunggu hasilnya.
+    """
+
+    def __init__(self, ttl=30, maxsize=256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(kind, branch=ALL_BRANCHES, bucket=None, term=None, page=None):
+        return (kind, branch, bucket, term, page)
+
+    def get_or_load(self, key, loader):
+        now = time.monotonic()
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None and hit[0] > now:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return hit[1]
+            flight = self._inflight.get(key)
+            if flight is None:
+                flight = self._inflight[key] = _Flight()
+                self.misses += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+        if not leader:
+            # Kunci yang sama sedang dimuat sesi lain: tunggu hasilnya, bukan query kedua
+            flight.done.wait()
+            if flight.error is not None: raise flight.error
+            return flight.value
+        # Loader dijalankan di luar lock supaya query lambat tidak memblokir sesi lain
+        try:
+            value = flight.value = loader()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            with self._lock:
+                self._data[key] = (time.monotonic() + self.ttl, value)
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+            return value
+        finally:
+            with self._lock: self._inflight.pop(key, None)
+            flight.done.set()
+
+    def invalidate(self, branch=ALL_BRANCHES):
+        """Buang entri yang terdampak penulisan.
+
+        Tanpa argumen semua entri dibuang. Dengan ``branch``, hanya entri cabang
+        itu dan entri lintas cabang (yang ikut memuat data cabang itu).
+        """
+        with self._lock:
+            if branch is ALL_BRANCHES:
+                n = len(self._data)
+                self._data.clear()
+            else:
+                stale = [k for k in self._data if k[1] in (branch, ALL_BRANCHES)]
+                for k in stale: del self._data[k]
+                n = len(stale)
+            self.invalidations += n
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data), "maxsize": self.maxsize, "ttl": self.ttl,
+                "hits": self.hits, "misses": self.misses, "coalesced": self.coalesced,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "evictions": self.evictions, "invalidations": self.invalidations,
+            }
+
+
+class PdfCache:
+    """LRU berbatas ukuran (byte) untuk PDF Surat Jalan, dipakai bersama semua sesi.
+
+    Kunci ``(order_id, hash_isi)``: bila isi order berubah, hash berubah dan PDF
+    dirender ulang; versi lama order yang sama langsung dibuang.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._by_order = {}
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _drop(self, key):
+        self.size -= len(self._data.pop(key))
+        if self._by_order.get(key[0]) == key: del self._by_order[key[0]]
+
+    def get(self, key):
+        with self._lock:
+            data = self._data.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes: return
+        with self._lock:
+            old = self._by_order.get(key[0])
+            if old is not None and old in self._data: self._drop(old)
+            self._data[key] = data
+            self._by_order[key[0]] = key
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+
+    def get_or_render(self, key, render):
+        data = self.get(key)
+        if data is None:
+            # Render di luar lock: PDF lambat tidak memblokir sesi lain
+            data = render()
+            self.put(key, data)
+        return data
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "items": len(self._data), "bytes": self.size, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0, "evictions": self.evictions,
+            }
@@ -0,0 +1,114 @@
+# Snapshot order aktif (belum selesai) per proses, diperbarui dari change feed shipment_events.
+# Dashboard membaca hitungan bucket & badge dari snapshot ini (tanpa query), dan hanya rerun
+# bila ada perubahan di cabangnya (versi per cabang naik).
+#
+# Sumber event: polling tabel shipment_events dengan watermark id (repo.events_since), sama
+# untuk Supabase dan SQLite. Pelanggan lain (mis. Supabase Realtime di klien async) cukup
+# memanggil ChangeFeed.apply dengan baris event yang sama.
+
+import threading
+import time
+from collections import Counter
+
+import repository
+import status_model
+
+POLL_INTERVAL = 3       # detik minimal antar pembacaan event (satu query per proses, bukan per sesi)
+RELOAD_INTERVAL = 600   # detik; isi ulang penuh berkala menambal event yang commit terlambat saat load
+LOOKBACK = 200          # id terakhir dibaca ulang: transaksi paralel bisa commit dengan id lebih kecil
+SNAPSHOT_COLUMNS = ["order_id", "branch", "status", "status_category"]
+ACTIVE = [c for c in status_model.CATEGORIES if c != status_model.DONE]
+NEW_STATUS = "Menunggu Konfirmasi"
+
+
+class ChangeFeed:
+    """Order aktif per cabang + versi per cabang, dijaga up to date dari event status."""
+
+    def __init__(self, on_change=None):
+        self._lock = threading.Lock()
+        self.orders = {}            # order_id -> (branch, status, kategori, id event terakhir)
+        self._gone = {}             # order_id -> id event selesai/hapus, supaya event lama tidak menghidupkan lagi
+        self._counts = {}           # cabang -> Counter(kategori + "konfirmasi")
+        self.versions = Counter()   # cabang -> jumlah perubahan yang sudah diterapkan
+        self.last_id = 0
+        self._base = 0              # watermark saat load: event sampai id ini sudah tercermin di snapshot
+        self.loaded = False
+        self._loaded_at = 0.0
+        self.on_change = on_change  # dipanggil per cabang yang berubah (mis. invalidasi QueryCache)
+        self._last_poll = 0.0
+
+    def _count(self, row, sign):
+        c = self._counts.setdefault(row[0], Counter())
+        c[row[2]] += sign
+        if row[1] == NEW_STATUS: c["konfirmasi"] += sign
+
+    def load(self, repo):
+        """Isi dari tabel shipments; watermark diambil dulu supaya tidak ada event yang terlewat."""
+        wm = repo.latest_event_id()
+        # Dibaca per halaman: satu query tanpa batas dipotong max-rows PostgREST (default 1000)
+        rows = [r for b in ACTIVE for r in repo.iter_bucket(b, SNAPSHOT_COLUMNS)]
+        with self._lock:
+            old = self._counts
+            self.orders, self._gone, self._counts = {}, {}, {}
+            for r in rows:
+                row = (r["branch"], r["status"], r["status_category"], wm)
+                self.orders[r["order_id"]] = row
+                self._count(row, 1)
+            self.last_id = self._base = wm
+            self.loaded = True
+            self._loaded_at = time.monotonic()
+            changed = {b for b in set(old) | set(self._counts) if old.get(b, Counter()) != self._counts.get(b, Counter())}
+            self.versions.update(changed)
+        return changed
+
+    def apply(self, events):
+        """Terapkan event (urutan bebas, boleh berulang); kembalikan cabang yang berubah."""
+        changed = set()
+        with self._lock:
+            for ev in events:
+                oid, eid = ev["order_id"], ev["id"]
+                if eid <= self._base: continue
+                cur = self.orders.get(oid)
+                if eid <= (cur[3] if cur else self._gone.get(oid, 0)): continue
+                if cur: self._count(cur, -1); changed.add(cur[0])
+                if ev["kind"] in ("delete", "archive") or ev["status_category"] == status_model.DONE:
+                    self.orders.pop(oid, None)
+                    self._gone[oid] = eid
+                else:
+                    row = self.orders[oid] = (ev["branch"], ev["status"], ev["status_category"], eid)
+                    self._count(row, 1)
+                    changed.add(row[0])
+                self.last_id = max(self.last_id, eid)
+            floor = self.last_id - LOOKBACK
+            if len(self._gone) > 4 * LOOKBACK: self._gone = {k: v for k, v in self._gone.items() if v > floor}
+            self.versions.update(changed)
+        return changed
+
+    def refresh(self, repo, force=False):
+        """Baca event baru (paling sering tiap ``POLL_INTERVAL`` detik); kembalikan cabang yang berubah."""
+        with self._lock:
+            if not force and time.monotonic() - self._last_poll < POLL_INTERVAL: return set()
+            self._last_poll = time.monotonic()
+        if not self.loaded or time.monotonic() - self._loaded_at > RELOAD_INTERVAL:
+            changed = self.load(repo)
+        else:
+            changed, after = set(), max(self._base, self.last_id - LOOKBACK)
+            while True:
+                rows = repo.events_since(after, repository.EVENT_PAGE_SIZE)
+                changed |= self.apply(rows)
+                if len(rows) < repository.EVENT_PAGE_SIZE: break
+                after = rows[-1]["id"]
+        if self.on_change:
+            for b in changed: self.on_change(b)
+        return changed
+
+    def version(self, branch=None):
+        """Versi snapshot untuk satu cabang (atau semua bila ``branch`` None)."""
+        with self._lock: return sum(self.versions.values()) if branch is None else self.versions[branch]
+
+    def counts(self, branch=None):
+        """``{'pending': n, 'shipping': m, 'konfirmasi': k}`` untuk satu cabang / semua."""
+        with self._lock:
+            parts = [self._counts.get(branch, Counter())] if branch is not None else list(self._counts.values())
+            total = sum(parts, Counter())
+        return {"pending": total["pending"], "shipping": total["shipping"], "konfirmasi": total["konfirmasi"]}
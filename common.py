@@ -0,0 +1,114 @@
+# Konteks bersama semua halaman: secrets, repository, cache query, instrumentasi.
+# Di-import sekali per proses (modul Python), objek berat dibuat lewat st.cache_resource.
+# Modul ini sengaja ringan: pandas / PDF / Excel hanya di-import oleh halaman yang memakainya.
+
+import os
+
+import streamlit as st
+
+import db
+import perf
+import repository
+from cache import QueryCache, PdfCache, ALL_BRANCHES
+from outbox import Outbox, Flusher
+
+# --- LINK APLIKASI ---
+APP_BASE_URL = "https://delivery-tracker.streamlit.app" 
+
+# --- BACKEND DATA ---
+# "supabase" (produksi) atau "sqlite" (lokal, untuk benchmark & uji beban tanpa Supabase)
+DATA_BACKEND = os.environ.get("DELIVERY_BACKEND", "supabase")
+
+# --- LOAD SECRETS ---
+try:
+    if DATA_BACKEND == "supabase":
+        url = st.secrets["SUPABASE_URL"]
+        key = st.secrets["SUPABASE_KEY"]
+    ADMIN_PASSWORD = st.secrets["passwords"]["admin"]
+    SALES_CREDENTIALS = st.secrets["passwords"]["sales"]
+    SPV_CREDENTIALS = st.secrets["passwords"]["spv"]
+    GATEKEEPER_PASSWORD = st.secrets["passwords"].get("gatekeeper", "blibli")
+except:
+    GATEKEEPER_PASSWORD = "blibli"
+    if not 'supabase' in locals():
+        st.error("Secrets belum lengkap.")
+        st.stop()
+
+# QR Surat Jalan: layanan lacak ringan (tracking_server.py) bila sudah di-deploy, selain itu aplikasi ini
+QR_BASE_URL = st.secrets.get("tracking_base_url", APP_BASE_URL)
+
+# --- KONEKSI DATABASE (SATU CLIENT PER PROSES, BUKAN PER RERUN) ---
+DB_CONFIG = st.secrets.get("db", {})
+
+@st.cache_resource
+def get_supabase():
+    db.configure(read_retries=DB_CONFIG.get("read_retries"), backoff_base=DB_CONFIG.get("backoff_base"),
+                 backoff_max=DB_CONFIG.get("backoff_max"))
+    return db.make_client(url, key, timeout=DB_CONFIG.get("timeout", db.DEFAULT_TIMEOUT),
+                          max_connections=DB_CONFIG.get("max_connections", db.MAX_CONNECTIONS))
+
+@st.cache_resource
+def get_repository():
+    if DATA_BACKEND == "sqlite":
+        return repository.SQLiteRepository(os.environ.get("DELIVERY_SQLITE_PATH", ":memory:"))
+    return repository.SupabaseRepository(get_supabase())
+
+repo = get_repository()
+
+# --- CACHE QUERY (BERSAMA UNTUK SEMUA SESI DALAM SATU PROSES) ---
+CACHE_TTL = 30        # detik
+CACHE_MAXSIZE = 256   # jumlah bentuk query yang disimpan
+
+@st.cache_resource
+def get_query_cache():
+    return QueryCache(ttl=CACHE_TTL, maxsize=CACHE_MAXSIZE)
+
+qcache = get_query_cache()
+
+# --- CACHE PDF SURAT JALAN (BYTES, BUKAN BASE64 DI SESSION) ---
+PDF_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+@st.cache_resource
+def get_pdf_cache():
+    return PdfCache(max_bytes=PDF_CACHE_MAX_BYTES)
+
+pdf_cache = get_pdf_cache()
+
+# --- OUTBOX ORDER SALES (ANTREAN LOKAL, DIKIRIM THREAD LATAR) ---
+OUTBOX_CONFIG = st.secrets.get("outbox", {})
+# Default di samping app (bukan direktori kerja), agar antrean tidak tercecer ke folder asal `streamlit run`
+OUTBOX_DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "outbox.db")
+
+@st.cache_resource
+def get_outbox():
+    box = Outbox(OUTBOX_CONFIG.get("path", os.environ.get("DELIVERY_OUTBOX_PATH", OUTBOX_DEFAULT_PATH)))
+    Flusher(box, repo, interval=OUTBOX_CONFIG.get("flush_interval", 5), on_flushed=qcache.invalidate).start()
+    return box
+
+outbox = get_outbox()
+
+# --- INSTRUMENTASI LATENCY ---
+PERF_CONFIG = st.secrets.get("perf", {})
+
+@st.cache_resource
+def setup_perf():
+    perf.configure(buffer_size=PERF_CONFIG.get("buffer_size"), json_logs=PERF_CONFIG.get("json_logs"))
+    return perf.BUFFER
+
+setup_perf()
+
+def cached(kind, loader, branch=ALL_BRANCHES, bucket=None, term=None, page=None):
+    return qcache.get_or_load(QueryCache.make_key(kind, branch, bucket, term, page), loader)
+
+# --- FUNGSI BANTUAN ---
+def get_branch_list():
+    # Daftar cabang diambil dari kredensial login (tanpa scan tabel)
+    return sorted(set(SALES_CREDENTIALS.keys()) | set(SPV_CREDENTIALS.keys()))
+
+# --- QUERY DASHBOARD (FILTER & HITUNG DI DATABASE) ---
+def count_shipments(branch=None, bucket=None, status=None, search=""):
+    return cached("count", lambda: repo.count(branch, bucket, status, search), branch, bucket, (status, search) if search else status)
+
+def fetch_bucket_rows(branch, bucket, cols, search="", sort="created_at", desc=True, offset=0, limit=None):
+    return cached("bucket_rows", lambda: repo.list_bucket(branch, bucket, cols, search, sort, desc, offset, limit),
+                  branch, bucket, (",".join(cols), search, sort, desc, limit), offset)
@@ -0,0 +1,111 @@
+# Koneksi Supabase: satu client per proses (koneksi HTTP keep-alive dipakai ulang),
+# retry dengan jittered backoff untuk query baca, dan statistik per jenis panggilan.
+
+import random
+import threading
+import time
+
+import httpx
+from postgrest.exceptions import APIError
+from supabase import create_client
+from supabase.client import ClientOptions
+
+import perf
+
+DEFAULT_TIMEOUT = 10      # detik per request
+MAX_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 60     # detik koneksi idle tetap dibuka
+READ_RETRIES = 3          # percobaan ulang (di luar percobaan pertama) untuk query baca
+BACKOFF_BASE = 0.2
+BACKOFF_MAX = 2.0
+
+# Kode error PostgREST/Postgres yang layak dicoba ulang (koneksi pool penuh, query dibatalkan)
+TRANSIENT_CODES = {"PGRST000", "PGRST001", "PGRST002", "PGRST003", "57014", "08000", "08003", "08006", "53300"}
+# Awalan kode error yang berarti request ditolak (data / constraint / skema / request), bukan gangguan
+REJECT_PREFIXES = ("22", "23", "42", "PGRST")
+
+def configure(read_retries=None, backoff_base=None, backoff_max=None):
+    global READ_RETRIES, BACKOFF_BASE, BACKOFF_MAX
+    if read_retries is not None: READ_RETRIES = int(read_retries)
+    if backoff_base is not None: BACKOFF_BASE = float(backoff_base)
+    if backoff_max is not None: BACKOFF_MAX = float(backoff_max)
+
+def make_client(url, key, timeout=DEFAULT_TIMEOUT, max_connections=MAX_CONNECTIONS):
+    """Client Supabase dengan pool koneksi httpx sendiri (dipanggil sekali per proses)."""
+    http = httpx.Client(
+        timeout=httpx.Timeout(timeout, connect=min(timeout, 5)),
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections,
+                            keepalive_expiry=KEEPALIVE_EXPIRY),
+    )
+    try: opts = ClientOptions(postgrest_client_timeout=timeout, httpx_client=http)
+    except TypeError:  # supabase-py lama belum mendukung httpx_client
+        http.close()
+        opts = ClientOptions(postgrest_client_timeout=timeout)
+    return create_client(url, key, options=opts)
+
+def is_transient(e):
+    if isinstance(e, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)): return True
+    return isinstance(e, APIError) and e.code in TRANSIENT_CODES
+
+def is_rejected(e):
+    # Dicoba ulang pun hasilnya sama; error tanpa kode (mis. 502 dari proxy) dianggap sementara
+    return isinstance(e, APIError) and bool(e.code) and str(e.code).startswith(REJECT_PREFIXES) and not is_transient(e)
+
+def describe_error(e):
+    # Pesan singkat untuk user, bukan stack trace
+    if isinstance(e, httpx.TimeoutException): return "Server database terlalu lama merespons, coba lagi sebentar."
+    if isinstance(e, (httpx.NetworkError, httpx.RemoteProtocolError)): return "Tidak bisa terhubung ke server database."
+    if isinstance(e, APIError): return e.message or str(e)
+    return str(e)
+
+
+class CallStats:
+    """Jumlah panggilan, error, retry dan latency per label (mis. ``shipments.select``)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def record(self, label, ms, ok, retries=0, rows=None):
+        perf.record("db", label, ms, rows, ok)
+        with self._lock:
+            s = self._data.setdefault(label, {"calls": 0, "errors": 0, "retries": 0, "total_ms": 0.0, "max_ms": 0.0})
+            s["calls"] += 1
+            s["errors"] += 0 if ok else 1
+            s["retries"] += retries
+            s["total_ms"] += ms
+            s["max_ms"] = max(s["max_ms"], ms)
+
+    def summary(self):
+        with self._lock:
+            return [{"label": k, "calls": v["calls"], "errors": v["errors"], "retries": v["retries"],
+                     "avg_ms": round(v["total_ms"] / v["calls"], 1), "max_ms": round(v["max_ms"], 1)}
+                    for k, v in sorted(self._data.items())]
+
+    def reset(self):
+        with self._lock: self._data.clear()
+
+STATS = CallStats()
+
+def execute(query, label="query", idempotent=True):
+    """Jalankan builder PostgREST (pengganti ``query.execute()``).
+
+    Query baca (``idempotent=True``) dicoba ulang maksimal ``READ_RETRIES`` kali
+    untuk error sementara, dengan jeda acak (full jitter) yang naik eksponensial.
+    Penulisan hanya dicoba sekali.
+    """
+    retries = READ_RETRIES if idempotent else 0
+    attempt = 0
+    t0 = time.perf_counter()
+    while True:
+        try:
+            res = query.execute()
+            rows = res.count if res.count is not None else len(res.data) if isinstance(res.data, list) else None
+            STATS.record(label, (time.perf_counter() - t0) * 1000, True, attempt, rows)
+            return res
+        except Exception as e:
+            if attempt >= retries or not is_transient(e):
+                STATS.record(label, (time.perf_counter() - t0) * 1000, False, attempt)
+                raise
+            time.sleep(random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)))
+            attempt += 1
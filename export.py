@@ -0,0 +1,84 @@
+# Export laporan Manajemen Data.
+# Baris diambil per halaman (repo.iter_export, keyset pada kolom id) dan langsung ditulis ke file,
+# jadi memori tidak ikut membesar walau riwayat pengiriman sudah puluhan ribu baris.
+
+import csv
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import xlsxwriter
+
+import perf
+
+DATE_COLUMNS = ("created_at", "last_updated")
+HEADER_FORMAT = {'bold': True, 'fg_color': '#0095DA', 'font_color': '#FFFFFF', 'border': 1}
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "delivery_exports")
+MAX_FILE_AGE = 3600  # detik, file export lama dibersihkan saat export baru dibuat
+
+def format_ts(value):
+    # Sama dengan format laporan lama: dd/mm/YYYY HH:MM
+    if not value: return ""
+    try: return datetime.strptime(str(value)[:16], "%Y-%m-%dT%H:%M").strftime('%d/%m/%Y %H:%M')
+    except ValueError: return str(value)
+
+def _cell(col, value):
+    if col in DATE_COLUMNS: return format_ts(value)
+    if value is None or isinstance(value, (str, int, float, bool)): return value
+    return str(value)
+
+def write_xlsx(rows, path):
+    # constant_memory: xlsxwriter membuang tiap baris ke disk setelah ditulis
+    wb = xlsxwriter.Workbook(path, {'constant_memory': True})
+    ws = wb.add_worksheet('Laporan')
+    fmt = wb.add_format(HEADER_FORMAT)
+    cols, n = None, 0
+    for r in rows:
+        if cols is None:
+            cols = list(r.keys())
+            for i, c in enumerate(cols): ws.write(0, i, c, fmt); ws.set_column(i, i, 20)
+        n += 1
+        ws.write_row(n, 0, [_cell(c, r.get(c)) for c in cols])
+    wb.close()
+    return n
+
+def write_csv(rows, path):
+    n = 0
+    # utf-8-sig supaya langsung terbaca benar di Excel
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        wr = None
+        for r in rows:
+            if wr is None:
+                wr = csv.writer(f)
+                cols = list(r.keys())
+                wr.writerow(cols)
+            wr.writerow(["" if v is None else v for v in (_cell(c, r.get(c)) for c in cols)])
+            n += 1
+    return n
+
+def cleanup_old_exports(max_age=MAX_FILE_AGE):
+    if not os.path.isdir(EXPORT_DIR): return
+    limit = time.time() - max_age
+    for name in os.listdir(EXPORT_DIR):
+        path = os.path.join(EXPORT_DIR, name)
+        try:
+            if os.path.getmtime(path) < limit: os.unlink(path)
+        except OSError: pass
+
+def read_file(path):
+    with open(path, "rb") as f: return f.read()
+
+def export_to_file(repo, fmt="xlsx", branch=None, start=None, end=None, include_archive=False):
+    """Tulis export ke file sementara; kembalikan ``(path, jumlah_baris)``.
+
+    ``include_archive=True`` ikut menulis order dari tabel arsip (setelah tabel aktif).
+    """
+    cleanup_old_exports()
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=f".{fmt}", dir=EXPORT_DIR)
+    os.close(fd)
+    with perf.timer("export", fmt) as t:
+        rows = repo.iter_export(branch, start, end, include_archive=include_archive)
+        n = t["rows"] = write_xlsx(rows, path) if fmt == "xlsx" else write_csv(rows, path)
+    return path, n
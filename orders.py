@@ -0,0 +1,132 @@
+# Aturan data order (dipakai form Input Delivery Order & upload massal).
+
+import db
+import status_model
+from repository import DuplicateOrderError
+
+DELIVERY_TYPES = ["Reguler", "Tukar Tambah", "Express"]
+INSTALL_OPTS = ["Tidak", "Ya - Vendor"]
+NEW_STATUS = "Menunggu Konfirmasi"
+STATUS_OPTIONS = status_model.STATUS_OPTIONS
+
+# Kolom file upload = nama kolom tabel shipments
+IMPORT_COLUMNS = ["order_id", "sales_name", "sales_phone", "customer_name", "customer_phone",
+                  "delivery_address", "product_name", "delivery_type", "old_product_name",
+                  "installation_opt", "installation_fee"]
+INSERT_CHUNK = 200
+UPDATE_CHUNK = 200
+
+def build_payload(order_id, sales_name, sales_phone, customer_name, customer_phone, delivery_address,
+                  product_name, delivery_type, branch, old_product_name, installation_opt, installation_fee, now):
+    return {
+        "order_id": order_id, "customer_name": customer_name, "customer_phone": customer_phone,
+        "delivery_address": delivery_address, "product_name": product_name, "delivery_type": delivery_type,
+        "sales_name": sales_name, "sales_phone": sales_phone, "branch": branch,
+        **status_model.status_fields(NEW_STATUS),
+        "last_updated": now.isoformat(),
+        "installation_opt": installation_opt, "installation_fee": installation_fee,
+        "old_product_name": old_product_name
+    }
+
+def validate_order(p):
+    """Kembalikan pesan error (str) atau None bila order valid."""
+    if not (p.get("order_id") and p.get("sales_name") and p.get("customer_name") and p.get("product_name")):
+        return "⚠️ Data wajib belum lengkap (ID, Sales, Customer, Barang)."
+    if p.get("delivery_type") == "Tukar Tambah" and not p.get("old_product_name"):
+        return "⚠️ Anda memilih Tukar Tambah. Harap isi Detail Barang Lama!"
+    return None
+
+def _pick(value, choices, default):
+    value = str(value or "").strip()
+    if not value: return default
+    for c in choices:
+        if c.lower() == value.lower(): return c
+    return None
+
+def prepare_import(records, branch, now):
+    """Validasi semua baris file upload sekaligus.
+
+    Mengembalikan ``(payloads, errors, rows)``; ``errors`` berisi dict
+    ``{"baris", "order_id", "error"}`` dengan nomor baris sesuai file (header = baris 1),
+    ``rows`` memetakan order_id yang valid ke nomor barisnya.
+    """
+    payloads, errors, seen = [], [], {}
+    for i, rec in enumerate(records, start=2):
+        r = {c: str(rec.get(c) or "").strip() for c in IMPORT_COLUMNS}
+        tipe = _pick(r["delivery_type"], DELIVERY_TYPES, "Reguler")
+        inst = _pick(r["installation_opt"], INSTALL_OPTS, "Tidak")
+        if tipe is None: msg = f"⚠️ Tipe Pengiriman '{r['delivery_type']}' tidak dikenal."
+        elif inst is None: msg = f"⚠️ Opsi Instalasi '{r['installation_opt']}' tidak dikenal."
+        else:
+            p = build_payload(r["order_id"], r["sales_name"], r["sales_phone"], r["customer_name"], r["customer_phone"],
+                              r["delivery_address"], r["product_name"], tipe, branch,
+                              r["old_product_name"] if tipe == "Tukar Tambah" else "", inst,
+                              r["installation_fee"] if inst == "Ya - Vendor" else "", now)
+            msg = validate_order(p)
+            if not msg and p["order_id"] in seen: msg = f"⛔ Order ID dobel di file (sama dengan baris {seen[p['order_id']]})."
+        if msg:
+            errors.append({"baris": i, "order_id": r["order_id"], "error": msg}); continue
+        seen[p["order_id"]] = i
+        payloads.append(p)
+    return payloads, errors, seen
+
+def insert_batches(repo, payloads, chunk=INSERT_CHUNK):
+    """Insert per batch; batch yang gagal diulang per baris agar error bisa ditunjuk.
+
+    Mengembalikan ``(inserted, errors)`` dengan ``errors`` = {order_id: pesan}.
+    """
+    inserted, errors = [], {}
+    for i in range(0, len(payloads), chunk):
+        part = payloads[i:i + chunk]
+        try:
+            repo.insert(part)
+            inserted.extend(part)
+        except Exception:
+            for p in part:
+                try:
+                    repo.insert(p)
+                    inserted.append(p)
+                except DuplicateOrderError:
+                    errors[p["order_id"]] = "⛔ Order ID sudah ada."
+                except Exception as e:
+                    errors[p["order_id"]] = f"Error: {db.describe_error(e)}"
+    return inserted, errors
+
+def import_orders(repo, records, branch, now):
+    """Validasi -> cek duplikat ke database (satu query) -> insert batch.
+
+    Baris bermasalah dilaporkan tanpa membatalkan baris lain.
+    """
+    payloads, errors, rows = prepare_import(records, branch, now)
+    dup = repo.existing_ids([p["order_id"] for p in payloads]) if payloads else set()
+    fresh = []
+    for p in payloads:
+        if p["order_id"] in dup: errors.append({"baris": rows[p["order_id"]], "order_id": p["order_id"], "error": "⛔ Order ID sudah ada."})
+        else: fresh.append(p)
+    inserted, failed = insert_batches(repo, fresh)
+    errors += [{"baris": rows[oid], "order_id": oid, "error": msg} for oid, msg in failed.items()]
+    return inserted, sorted(errors, key=lambda e: e["baris"])
+
+def bulk_update(repo, order_ids, fields, chunk=UPDATE_CHUNK):
+    """Update field yang sama untuk banyak order: satu ``update_many`` per chunk.
+
+    Chunk yang error diulang per order. Order yang tidak kembali di hasil update
+    (sudah dihapus / beda cabang) ikut dilaporkan gagal.
+    Mengembalikan ``(updated_ids, failed)`` dengan ``failed`` = {order_id: pesan}.
+    """
+    updated, failed = [], {}
+    for i in range(0, len(order_ids), chunk):
+        part = list(order_ids[i:i + chunk])
+        try:
+            done = set(repo.update_many(part, fields))
+        except Exception:
+            done = set()
+            for oid in part:
+                try:
+                    if repo.update(oid, fields): done.add(oid)
+                except Exception as e:
+                    failed[oid] = f"Error: {db.describe_error(e)}"
+        for oid in part:
+            if oid in done: updated.append(oid)
+            elif oid not in failed: failed[oid] = "Order tidak ditemukan."
+    return updated, failed
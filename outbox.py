@@ -0,0 +1,205 @@
+# Antrean lokal (SQLite) untuk order dari Sales: submit cukup menulis ke file lokal, lalu
+# thread Flusher mengirim ke repository per batch. Order tetap aman bila Supabase lambat /
+# putus sebentar, dan terkirim setelah proses start ulang.
+#
+# Pengiriman idempoten per order_id: bila insert sempat masuk tapi responsnya hilang, percobaan
+# berikutnya kena duplikat; baris yang sudah ada dan isinya sama dianggap terkirim.
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+import db
+import repository
+
+FLUSH_INTERVAL = 5     # detik antar pengecekan antrean (submit baru membangunkan flusher lebih awal)
+FLUSH_BATCH = 50       # order per insert
+RETRY_BASE = 5         # detik, jeda percobaan ulang naik eksponensial
+RETRY_MAX = 300
+MATCH_FIELDS = ["order_id", "branch", "sales_name", "customer_name", "product_name"]
+
+OUTBOX_SCHEMA = """
+create table if not exists outbox (
+    order_id text primary key,
+    branch text,
+    payload text not null,
+    state text not null default 'pending',   -- pending | failed
+    attempts integer not null default 0,
+    last_error text,
+    queued_at real not null,
+    next_try real not null default 0
+);
+create index if not exists outbox_state_next on outbox (state, next_try);
+"""
+
+log = logging.getLogger(__name__)
+
+def _permanent(e):
+    # Ditolak backend (constraint / kolom / data): dicoba ulang pun tetap gagal
+    return isinstance(e, (sqlite3.IntegrityError, ValueError)) or db.is_rejected(e)
+
+
+class Outbox:
+    """Antrean order yang belum terkirim, disimpan di file SQLite (tahan restart)."""
+
+    def __init__(self, path="outbox.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
+        self.wake = threading.Event()   # di-set saat ada order baru, membangunkan Flusher
+        self.sent = 0
+        with self.lock:
+            if path != ":memory:": self.conn.execute("pragma journal_mode=wal")
+            self.conn.executescript(OUTBOX_SCHEMA)
+
+    def enqueue(self, payload):
+        """Simpan satu order; ``DuplicateOrderError`` bila order_id sudah ada di antrean."""
+        with self.lock:
+            try:
+                self.conn.execute("insert into outbox (order_id, branch, payload, queued_at) values (?, ?, ?, ?)",
+                                  (payload["order_id"], payload.get("branch"), json.dumps(payload), time.time()))
+                self.conn.commit()
+            except sqlite3.IntegrityError as e:
+                self.conn.rollback()
+                raise repository.DuplicateOrderError(str(e)) from e
+        self.wake.set()
+
+    def get(self, order_id):
+        with self.lock:
+            r = self.conn.execute("select payload from outbox where order_id = ?", (order_id,)).fetchone()
+        return json.loads(r["payload"]) if r else None
+
+    def rows(self, branch=None, state=None):
+        """Isi antrean (tanpa payload) untuk ditampilkan, terlama dulu."""
+        conds, params = [], []
+        if branch: conds.append("branch = ?"); params.append(branch)
+        if state: conds.append("state = ?"); params.append(state)
+        where = f" where {' and '.join(conds)}" if conds else ""
+        with self.lock:
+            cur = self.conn.execute(f"select order_id, branch, state, attempts, last_error, queued_at from outbox{where} order by queued_at", params)
+            return [dict(r) for r in cur.fetchall()]
+
+    def depth(self, branch=None):
+        """Jumlah order per state: ``{'pending': n, 'failed': m}``."""
+        sql = "select state, count(*) n from outbox" + (" where branch = ?" if branch else "") + " group by state"
+        with self.lock:
+            got = {r["state"]: r["n"] for r in self.conn.execute(sql, (branch,) if branch else ())}
+        return {"pending": got.get("pending", 0), "failed": got.get("failed", 0)}
+
+    def retry(self, order_id):
+        # Order gagal dikirim ulang (mis. setelah order bentrok di server dihapus)
+        with self.lock:
+            self.conn.execute("update outbox set state = 'pending', next_try = 0, last_error = null where order_id = ?", (order_id,))
+            self.conn.commit()
+        self.wake.set()
+
+    def discard(self, order_id):
+        with self.lock:
+            self.conn.execute("delete from outbox where order_id = ?", (order_id,))
+            self.conn.commit()
+
+    def stats(self):
+        d = self.depth()
+        with self.lock:
+            r = self.conn.execute("select min(queued_at) t from outbox where state = 'pending'").fetchone()
+        return dict(d, sent=self.sent, oldest_pending_s=round(time.time() - r["t"], 1) if r["t"] else None, path=self.path)
+
+    # --- PENGIRIMAN ---
+    def _due(self, limit):
+        with self.lock:
+            cur = self.conn.execute("select order_id, payload, attempts from outbox where state = 'pending' and next_try <= ? "
+                                    "order by queued_at limit ?", (time.time(), limit))
+            return [(r["order_id"], json.loads(r["payload"]), r["attempts"]) for r in cur.fetchall()]
+
+    def _done(self, ids):
+        with self.lock:
+            self.conn.executemany("delete from outbox where order_id = ?", [(i,) for i in ids])
+            self.conn.commit()
+        self.sent += len(ids)
+
+    def _fail(self, order_id, error):
+        with self.lock:
+            self.conn.execute("update outbox set state = 'failed', last_error = ? where order_id = ?", (error, order_id))
+            self.conn.commit()
+
+    def _postpone(self, batch, error):
+        now = time.time()
+        with self.lock:
+            self.conn.executemany("update outbox set attempts = ?, last_error = ?, next_try = ? where order_id = ?",
+                                  [(a + 1, error, now + min(RETRY_MAX, RETRY_BASE * 2 ** a), oid) for oid, _, a in batch])
+            self.conn.commit()
+
+    def _reconcile(self, repo, batch):
+        """Setelah duplikat: pisahkan order yang ternyata sudah masuk dari yang bentrok; sisanya dikembalikan."""
+        taken = repo.existing_ids([oid for oid, _, _ in batch])
+        rest = []
+        for item in batch:
+            oid, payload, _ = item
+            if oid not in taken: rest.append(item); continue
+            row = repo.get(oid, MATCH_FIELDS)
+            if row and all(str(row.get(k) or "") == str(payload.get(k) or "") for k in MATCH_FIELDS): self._done([oid])
+            else: self._fail(oid, f"Order ID {oid} sudah ada di server.")
+        return rest
+
+    def flush(self, repo, batch_size=FLUSH_BATCH):
+        """Kirim semua order yang jatuh tempo; kembalikan cabang yang menerima order baru."""
+        branches = set()
+        while True:
+            batch = self._due(batch_size)
+            if not batch: break
+            try:
+                repo.insert([p for _, p, _ in batch])
+            except repository.DuplicateOrderError:
+                rest = self._reconcile(repo, batch)
+                if rest: self._insert_one_by_one(repo, rest)
+            except Exception as e:
+                if _permanent(e): self._insert_one_by_one(repo, batch)
+                else:
+                    self._postpone(batch, db.describe_error(e))
+                    break
+            else: self._done([oid for oid, _, _ in batch])
+            branches.update(p.get("branch") for _, p, _ in batch)
+            if len(batch) < batch_size: break
+        return branches
+
+    def _insert_one_by_one(self, repo, batch):
+        # Satu baris bermasalah menggagalkan satu batch: pisahkan supaya order lain tetap terkirim
+        for item in batch:
+            oid, payload, _ = item
+            try: repo.insert([payload])
+            except repository.DuplicateOrderError:
+                for left in self._reconcile(repo, [item]): self._postpone([left], "Order ID bentrok, dicoba lagi.")
+            except Exception as e:
+                if _permanent(e): self._fail(oid, db.describe_error(e))
+                else: self._postpone([item], db.describe_error(e))
+            else: self._done([oid])
+
+
+class Flusher(threading.Thread):
+    """Thread latar yang mengosongkan Outbox ke repository (satu per proses)."""
+
+    def __init__(self, outbox, repo, interval=FLUSH_INTERVAL, batch_size=FLUSH_BATCH, on_flushed=None):
+        super().__init__(name="outbox-flusher", daemon=True)
+        self.outbox = outbox
+        self.repo = repo
+        self.interval = interval
+        self.batch_size = batch_size
+        self.on_flushed = on_flushed
+        self._halt = threading.Event()
+
+    def run(self):
+        while not self._halt.is_set():
+            try:
+                for branch in self.outbox.flush(self.repo, self.batch_size):
+                    if self.on_flushed: self.on_flushed(branch)
+            except Exception:
+                log.exception("Flush outbox gagal")
+            self.outbox.wake.wait(self.interval)
+            self.outbox.wake.clear()
+
+    def stop(self):
+        self._halt.set()
+        self.outbox.wake.set()
@@ -0,0 +1,39 @@
+# Jalankan beberapa query baca yang saling independen secara paralel.
+# Satu thread pool dipakai bersama oleh semua sesi dalam proses; waktu halaman
+# jadi kira-kira query paling lambat, bukan jumlah semua query.
+#
+# Task tidak boleh memanggil st.* (thread pool tidak punya konteks Streamlit);
+# cukup fungsi repo / cache yang mengembalikan data.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 8
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="fetch")
+        return _pool
+
+def fetch_all(tasks):
+    """Jalankan ``{nama: fungsi_tanpa_argumen}`` bersamaan, kembalikan ``{nama: hasil}``.
+
+    Semua task ditunggu sampai selesai; bila ada yang gagal, error task pertama
+    (urutan dict) dilempar ulang. Satu task saja langsung dijalankan di thread pemanggil.
+    """
+    if len(tasks) <= 1:
+        return {name: fn() for name, fn in tasks.items()}
+    futures = {name: get_pool().submit(fn) for name, fn in tasks.items()}
+    out, first_err = {}, None
+    for name, fut in futures.items():
+        try:
+            out[name] = fut.result()
+        except Exception as e:
+            if first_err is None: first_err = e
+    if first_err is not None: raise first_err
+    return out
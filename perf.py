@@ -0,0 +1,94 @@
+# Instrumentasi latency: sampel disimpan di ring buffer dalam proses (ukuran tetap),
+# diringkas jadi p50/p95/p99 untuk halaman Performance, dan opsional dikirim
+# sebagai log JSON terstruktur (env DELIVERY_PERF_LOG=1).
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+BUFFER_SIZE = 5000
+JSON_LOGS = os.environ.get("DELIVERY_PERF_LOG", "") not in ("", "0")
+
+log = logging.getLogger("delivery.perf")
+
+def percentile(sorted_values, p):
+    # Nearest-rank pada list yang sudah diurutkan
+    if not sorted_values: return 0.0
+    k = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[k]
+
+
+class PerfBuffer:
+    """Ring buffer sampel ``{ts, kind, name, ms, rows, ok}``; sampel tertua terbuang otomatis."""
+
+    def __init__(self, maxlen=BUFFER_SIZE):
+        self._lock = threading.Lock()
+        self._buf = deque(maxlen=maxlen)
+
+    def __len__(self):
+        return len(self._buf)
+
+    @property
+    def maxlen(self):
+        return self._buf.maxlen
+
+    def add(self, sample):
+        with self._lock: self._buf.append(sample)
+
+    def samples(self):
+        with self._lock: return list(self._buf)
+
+    def clear(self):
+        with self._lock: self._buf.clear()
+
+    def summary(self, kind=None):
+        groups = {}
+        for s in self.samples():
+            if kind and s["kind"] != kind: continue
+            groups.setdefault((s["kind"], s["name"]), []).append(s)
+        out = []
+        for (k, name), items in sorted(groups.items()):
+            ms = sorted(x["ms"] for x in items)
+            rows = [x["rows"] for x in items if x["rows"] is not None]
+            out.append({"kind": k, "name": name, "count": len(items),
+                        "errors": sum(1 for x in items if not x["ok"]),
+                        "p50_ms": round(percentile(ms, 50), 1), "p95_ms": round(percentile(ms, 95), 1),
+                        "p99_ms": round(percentile(ms, 99), 1), "max_ms": round(ms[-1], 1),
+                        "avg_rows": round(sum(rows) / len(rows), 1) if rows else None})
+        return out
+
+BUFFER = PerfBuffer()
+
+def configure(buffer_size=None, json_logs=None):
+    global BUFFER, JSON_LOGS
+    if buffer_size and int(buffer_size) != BUFFER.maxlen: BUFFER = PerfBuffer(int(buffer_size))
+    if json_logs is not None: JSON_LOGS = bool(json_logs)
+    if JSON_LOGS and not log.handlers:
+        h = logging.StreamHandler()
+        h.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(h)
+        log.setLevel(logging.INFO)
+        log.propagate = False
+
+def record(kind, name, ms, rows=None, ok=True):
+    sample = {"ts": time.time(), "kind": kind, "name": name, "ms": ms, "rows": rows, "ok": ok}
+    BUFFER.add(sample)
+    if JSON_LOGS: log.info(json.dumps(dict(sample, ms=round(ms, 2))))
+
+@contextmanager
+def timer(kind, name):
+    """``with perf.timer("pdf", "single") as t: ...; t["rows"] = n``"""
+    info = {"rows": None, "ok": True}
+    t0 = time.perf_counter()
+    try:
+        yield info
+    except BaseException:
+        info["ok"] = False
+        raise
+    finally:
+        record(kind, name, (time.perf_counter() - t0) * 1000, info["rows"], info["ok"])
@@ -0,0 +1,596 @@
+# Lapisan akses data tabel shipments.
+# Semua halaman memanggil ShipmentRepository, bukan query builder Supabase langsung,
+# sehingga backend bisa diganti: SupabaseRepository (produksi) atau
+# SQLiteRepository (in-memory / file lokal untuk benchmark & uji beban).
+
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import db
+import status_model
+
+# Bucket dashboard = kategori status tersimpan (kolom status_category)
+BUCKETS = status_model.CATEGORIES
+
+COLUMNS = ["id", "created_at", "order_id", "customer_name", "customer_phone", "delivery_address",
+           "product_name", "delivery_type", "sales_name", "sales_phone", "branch", "status",
+           "last_updated", "courier", "resi", "installation_opt", "installation_fee", "old_product_name",
+           "status_code", "status_category"]
+EVENT_COLUMNS = ["id", "order_id", "branch", "kind", "status", "status_code", "status_category", "event_at", "recorded_at"]
+EXPORT_PAGE_SIZE = 1000
+EVENT_PAGE_SIZE = 1000
+ARCHIVE_BATCH = 500    # baris per transaksi pindah ke arsip
+BUCKET_SORTS = ("created_at", "last_updated", "order_id")   # urutan tabel bucket yang didukung index
+ID_QUERY_CHUNK = 500   # batas jumlah id per query in_() agar URL tidak kepanjangan
+WIB_OFFSET = timedelta(hours=7)
+
+
+class DuplicateOrderError(Exception):
+    """Order ID sudah ada di database."""
+
+
+class ShipmentRepository(ABC):
+    """Antarmuka akses data shipments yang dipakai semua halaman.
+
+    ``columns`` berupa list nama kolom; None berarti semua kolom.
+    ``bucket`` salah satu dari ``BUCKETS``.
+    Semua query membaca tabel aktif; ``archived=True`` / ``include_archive=True``
+    membaca tabel arsip (order selesai yang sudah dipindah ``archive_batch``).
+    """
+
+    @abstractmethod
+    def get(self, order_id, columns=None, archived=False): ...
+    @abstractmethod
+    def get_many(self, order_ids, columns=None): ...
+    @abstractmethod
+    def search_by_name(self, term, limit, columns=None, archived=False): ...
+    @abstractmethod
+    def count(self, branch=None, bucket=None, status=None, search=""): ...
+    @abstractmethod
+    def list_bucket(self, branch, bucket, columns=None, search="", sort="created_at", desc=True, offset=0, limit=None): ...
+    @abstractmethod
+    def iter_bucket(self, bucket, columns=None, branch=None, page_size=EXPORT_PAGE_SIZE): ...
+    @abstractmethod
+    def list_recent(self, branch=None, statuses=None, columns=None, limit=None): ...
+    @abstractmethod
+    def page(self, branch=None, search="", status=None, cursor=None, limit=50, columns=None): ...
+    @abstractmethod
+    def existing_ids(self, order_ids): ...
+    @abstractmethod
+    def insert(self, rows): ...
+    @abstractmethod
+    def update(self, order_id, fields): ...
+    @abstractmethod
+    def update_many(self, order_ids, fields): ...
+    @abstractmethod
+    def delete(self, order_id): ...
+    @abstractmethod
+    def delete_all(self): ...
+    @abstractmethod
+    def iter_export(self, branch=None, start=None, end=None, page_size=EXPORT_PAGE_SIZE, include_archive=False): ...
+    @abstractmethod
+    def events_since(self, after_id=0, limit=EVENT_PAGE_SIZE): ...
+    @abstractmethod
+    def latest_event_id(self): ...
+    @abstractmethod
+    def archive_batch(self, before, limit=ARCHIVE_BATCH): ...
+    @abstractmethod
+    def count_archive(self): ...
+
+
+def _day_start_utc(d):
+    # Rentang tanggal dari UI = tanggal WIB, created_at tersimpan UTC: 00:00 WIB = 17:00 UTC hari sebelumnya
+    return (datetime(d.year, d.month, d.day, tzinfo=timezone.utc) - WIB_OFFSET).isoformat()
+
+def _end_exclusive(end):
+    return _day_start_utc(end + timedelta(days=1))
+
+def _next_cursor(rows, limit):
+    # Query mengambil limit+1 baris; baris ekstra menandakan masih ada halaman berikutnya
+    if len(rows) <= limit: return rows, None
+    rows = rows[:limit]
+    return rows, (rows[-1]["created_at"], rows[-1]["id"])
+
+def _with_cursor_cols(columns):
+    # Kolom cursor keyset selalu ikut diambil
+    return list(dict.fromkeys(list(columns) + ["id", "created_at"])) if columns else None
+
+def _check_sort(sort):
+    if sort not in BUCKET_SORTS: raise ValueError(f"Urutan tidak didukung: {sort}")
+    return sort
+
+def _with_id(columns):
+    return list(dict.fromkeys(list(columns) + ["id"])) if columns else None
+
+def _with_order_id(columns):
+    return list(dict.fromkeys(["order_id"] + list(columns))) if columns else None
+
+def like_escape(term):
+    # Wildcard LIKE (% _) di input user di-escape dengan \ agar dicari apa adanya (mis. "SO_1");
+    # * (wildcard PostgREST) tidak bisa di-escape, jadi dibuang
+    return str(term).replace("*", "").replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# ==========================================
+# SUPABASE (POSTGREST)
+# ==========================================
+def quote_value(v):
+    # Nilai di dalam filter or_() PostgREST: dibungkus kutip, \ dan " di-escape
+    return '"' + str(v).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def _is_duplicate(e):
+    return getattr(e, "code", None) == "23505" or "duplicate key" in str(e)
+
+
+class SupabaseRepository(ShipmentRepository):
+
+    def __init__(self, client, table="shipments", events_table="shipment_events", archive_table="shipments_archive"):
+        self.client = client
+        self.table = table
+        self.events_table = events_table
+        self.archive_table = archive_table
+
+    def _select(self, columns=None, archived=False, **kw):
+        table = self.archive_table if archived else self.table
+        return self.client.table(table).select(",".join(columns) if columns else "*", **kw)
+
+    def get(self, order_id, columns=None, archived=False):
+        res = db.execute(self._select(columns, archived).eq("order_id", order_id).limit(1), "archive.get" if archived else "shipments.get")
+        return res.data[0] if res.data else None
+
+    def get_many(self, order_ids, columns=None):
+        found = {}
+        for i in range(0, len(order_ids), ID_QUERY_CHUNK):
+            q = self._select(_with_order_id(columns)).in_("order_id", list(order_ids[i:i + ID_QUERY_CHUNK]))
+            found.update((d["order_id"], d) for d in db.execute(q, "shipments.get_many").data or [])
+        return [found[o] for o in order_ids if o in found]
+
+    def search_by_name(self, term, limit, columns=None, archived=False):
+        q = self._select(columns, archived).ilike("customer_name", f"%{like_escape(term)}%").order("created_at", desc=True).limit(limit)
+        return db.execute(q, "archive.search_name" if archived else "shipments.search_name").data or []
+
+    @staticmethod
+    def _search(q, search):
+        # Cari sebagian order_id / nama customer (index trigram)
+        term = like_escape((search or "").strip())
+        if not term: return q
+        pat = quote_value(f"*{term}*")
+        return q.or_(f"order_id.ilike.{pat},customer_name.ilike.{pat}")
+
+    def count(self, branch=None, bucket=None, status=None, search=""):
+        # HEAD request + count=exact: hanya angka yang dikirim balik, bukan baris
+        q = self._select(["id"], count="exact", head=True)
+        if branch: q = q.eq("branch", branch)
+        if bucket: q = q.eq("status_category", bucket)
+        if status: q = q.eq("status", status)
+        return db.execute(self._search(q, search), "shipments.count").count or 0
+
+    def list_bucket(self, branch, bucket, columns=None, search="", sort="created_at", desc=True, offset=0, limit=None):
+        q = self._select(columns)
+        if branch: q = q.eq("branch", branch)
+        q = self._search(q.eq("status_category", bucket), search).order(_check_sort(sort), desc=desc).order("id", desc=desc)
+        if limit: q = q.range(offset, offset + limit - 1)
+        return db.execute(q, "shipments.list_bucket").data or []
+
+    def iter_bucket(self, bucket, columns=None, branch=None, page_size=EXPORT_PAGE_SIZE):
+        # Keyset pada id (respons PostgREST dibatasi max-rows, jadi satu query bisa terpotong diam-diam)
+        last_id = 0
+        while True:
+            q = self._select(_with_id(columns)).eq("status_category", bucket).gt("id", last_id).order("id").limit(page_size)
+            if branch: q = q.eq("branch", branch)
+            rows = db.execute(q, "shipments.bucket_page").data or []
+            yield from rows
+            if len(rows) < page_size: break
+            last_id = rows[-1]["id"]
+
+    def list_recent(self, branch=None, statuses=None, columns=None, limit=None):
+        q = self._select(columns).order("created_at", desc=True)
+        if branch: q = q.eq("branch", branch)
+        if statuses: q = q.in_("status", list(statuses))
+        if limit: q = q.limit(limit)
+        return db.execute(q, "shipments.list_recent").data or []
+
+    def page(self, branch=None, search="", status=None, cursor=None, limit=50, columns=None):
+        q = self._select(_with_cursor_cols(columns)).order("created_at", desc=True).order("id", desc=True).limit(limit + 1)
+        if branch: q = q.eq("branch", branch)
+        if status: q = q.eq("status", status)
+        q = self._search(q, search)
+        if cursor:
+            c_at, c_id = quote_value(cursor[0]), int(cursor[1])
+            q = q.or_(f"created_at.lt.{c_at},and(created_at.eq.{c_at},id.lt.{c_id})")
+        return _next_cursor(db.execute(q, "shipments.page").data or [], limit)
+
+    def existing_ids(self, order_ids):
+        # Order ID di arsip juga dianggap terpakai
+        found = set()
+        for archived in (False, True):
+            for i in range(0, len(order_ids), ID_QUERY_CHUNK):
+                q = self._select(["order_id"], archived).in_("order_id", list(order_ids[i:i + ID_QUERY_CHUNK]))
+                found.update(d["order_id"] for d in db.execute(q, "shipments.existing_ids").data or [])
+        return found
+
+    def insert(self, rows):
+        try:
+            return db.execute(self.client.table(self.table).insert(rows), "shipments.insert", idempotent=False).data or []
+        except Exception as e:
+            if _is_duplicate(e): raise DuplicateOrderError(str(e)) from e
+            raise
+
+    def update(self, order_id, fields):
+        q = self.client.table(self.table).update(fields).eq("order_id", order_id)
+        return db.execute(q, "shipments.update", idempotent=False).data or []
+
+    def update_many(self, order_ids, fields):
+        q = self.client.table(self.table).update(fields).in_("order_id", list(order_ids))
+        return [d["order_id"] for d in db.execute(q, "shipments.update_many", idempotent=False).data or []]
+
+    def delete(self, order_id):
+        db.execute(self.client.table(self.table).delete().eq("order_id", order_id), "shipments.delete", idempotent=False)
+
+    def delete_all(self):
+        db.execute(self.client.table(self.table).delete().neq("id", 0), "shipments.delete_all", idempotent=False)
+        db.execute(self.client.table(self.archive_table).delete().neq("id", 0), "archive.delete_all", idempotent=False)
+
+    def iter_export(self, branch=None, start=None, end=None, page_size=EXPORT_PAGE_SIZE, include_archive=False):
+        # Keyset pada id: WHERE id > last_id ORDER BY id LIMIT page_size
+        for archived in ((False, True) if include_archive else (False,)):
+            last_id = 0
+            while True:
+                # Arsip punya kolom archived_at; export tetap memakai kolom tabel aktif
+                q = self._select(COLUMNS if archived else None, archived).gt("id", last_id).order("id").limit(page_size)
+                if branch: q = q.eq("branch", branch)
+                if start: q = q.gte("created_at", _day_start_utc(start))
+                if end: q = q.lt("created_at", _end_exclusive(end))
+                rows = db.execute(q, "archive.export_page" if archived else "shipments.export_page").data or []
+                yield from rows
+                if len(rows) < page_size: break
+                last_id = rows[-1]["id"]
+
+    def archive_batch(self, before, limit=ARCHIVE_BATCH):
+        # Pindah + hapus dalam satu transaksi di fungsi database (sql/005_shipments_archive.sql)
+        q = self.client.rpc("archive_shipments", {"cutoff": before, "batch_size": limit})
+        return db.execute(q, "shipments.archive", idempotent=False).data or 0
+
+    def count_archive(self):
+        return db.execute(self._select(["id"], True, count="exact", head=True), "archive.count").count or 0
+
+    def events_since(self, after_id=0, limit=EVENT_PAGE_SIZE):
+        # Event ditulis trigger database (sql/004_status_events.sql), bukan oleh aplikasi
+        q = self.client.table(self.events_table).select(",".join(EVENT_COLUMNS)).gt("id", after_id).order("id").limit(limit)
+        return db.execute(q, "events.since").data or []
+
+    def latest_event_id(self):
+        res = db.execute(self.client.table(self.events_table).select("id").order("id", desc=True).limit(1), "events.latest")
+        return res.data[0]["id"] if res.data else 0
+
+
+# ==========================================
+# SQLITE (IN-MEMORY / FILE LOKAL)
+# ==========================================
+SQLITE_SCHEMA = """
+create table if not exists shipments (
+    id integer primary key autoincrement,
+    created_at text not null,
+    order_id text not null unique,
+    customer_name text, customer_phone text, delivery_address text,
+    product_name text, delivery_type text, sales_name text, sales_phone text,
+    branch text, status text, last_updated text, courier text, resi text,
+    installation_opt text, installation_fee text, old_product_name text,
+    status_code integer not null default 0,
+    status_category text not null default 'pending'
+);
+"""
+SQLITE_INDEXES = """
+create index if not exists shipments_branch_created_idx on shipments (branch, created_at desc, id desc);
+create index if not exists shipments_created_idx on shipments (created_at desc, id desc);
+create index if not exists shipments_customer_name_idx on shipments (customer_name collate nocase);
+create index if not exists shipments_status_idx on shipments (status);
+create index if not exists shipments_branch_category_idx on shipments (branch, status_category, created_at desc);
+create index if not exists shipments_category_idx on shipments (status_category, created_at desc);
+create index if not exists shipments_branch_category_updated_idx on shipments (branch, status_category, last_updated desc, id desc);
+create index if not exists shipments_category_updated_idx on shipments (status_category, last_updated desc, id desc);
+"""
+# Order selesai yang sudah diarsipkan (sama dengan sql/005_shipments_archive.sql)
+SQLITE_ARCHIVE = """
+create table if not exists shipments_archive (
+    id integer primary key,
+    created_at text not null,
+    order_id text not null unique,
+    customer_name text, customer_phone text, delivery_address text,
+    product_name text, delivery_type text, sales_name text, sales_phone text,
+    branch text, status text, last_updated text, courier text, resi text,
+    installation_opt text, installation_fee text, old_product_name text,
+    status_code integer not null default 0,
+    status_category text not null default 'pending',
+    archived_at text
+);
+create index if not exists shipments_archive_branch_created_idx on shipments_archive (branch, created_at desc, id desc);
+create index if not exists shipments_archive_customer_name_idx on shipments_archive (customer_name collate nocase);
+"""
+# Riwayat status append-only, diisi trigger (sama dengan sql/004_status_events.sql)
+SQLITE_EVENTS = """
+create table if not exists shipment_events (
+    id integer primary key autoincrement,
+    order_id text not null, branch text, kind text not null,
+    status text, status_code integer, status_category text,
+    event_at text, recorded_at text not null default (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+create index if not exists shipment_events_order_idx on shipment_events (order_id, id);
+create trigger if not exists shipments_event_insert after insert on shipments begin
+    insert into shipment_events (order_id, branch, kind, status, status_code, status_category, event_at)
+    values (new.order_id, new.branch, 'create', new.status, new.status_code, new.status_category, new.last_updated);
+end;
+create trigger if not exists shipments_event_status after update of status on shipments
+when new.status is not old.status begin
+    insert into shipment_events (order_id, branch, kind, status, status_code, status_category, event_at)
+    values (new.order_id, new.branch, 'status', new.status, new.status_code, new.status_category, new.last_updated);
+end;
+drop trigger if exists shipments_event_delete;
+create trigger shipments_event_delete after delete on shipments begin
+    insert into shipment_events (order_id, branch, kind, status, status_code, status_category)
+    values (old.order_id, old.branch,
+            case when exists (select 1 from shipments_archive a where a.order_id = old.order_id) then 'archive' else 'delete' end,
+            old.status, old.status_code, old.status_category);
+end;
+"""
+
+def utc_now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class SQLiteRepository(ShipmentRepository):
+    """Backend lokal dengan perilaku query yang sama seperti SupabaseRepository.
+
+    Satu koneksi dipakai bersama semua thread (sesi Streamlit) dan dijaga lock.
+    """
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
+        with self.lock:
+            self.conn.executescript(SQLITE_SCHEMA)
+            self._migrate_status_columns()
+            self.conn.executescript(SQLITE_INDEXES)
+            self.conn.executescript(SQLITE_ARCHIVE)
+            self._migrate_events()
+
+    def _migrate_status_columns(self):
+        # File database lama (sebelum status_category): tambah kolom lalu isi sekali
+        have = {r["name"] for r in self.conn.execute("pragma table_info(shipments)")}
+        if "status_category" in have: return
+        self.conn.execute("alter table shipments add column status_code integer not null default 0")
+        self.conn.execute("alter table shipments add column status_category text not null default 'pending'")
+        self.conn.create_function("status_code_of", 1, lambda s: status_model.STATUS_CODES.get(s, status_model.UNKNOWN_CODE))
+        self.conn.create_function("status_category_of", 1, status_model.classify)
+        self.conn.execute("update shipments set status_code = status_code_of(status), status_category = status_category_of(status)")
+        self.conn.commit()
+
+    def _migrate_events(self):
+        fresh = not self.conn.execute("select 1 from sqlite_master where name = 'shipment_events'").fetchone()
+        self.conn.executescript(SQLITE_EVENTS)
+        if not fresh: return
+        # Data lama: satu event 'create' (waktu WIB dari created_at) + event status terakhir bila sudah bergerak
+        self.conn.execute("""insert into shipment_events (order_id, branch, kind, status, status_code, status_category, event_at)
+            select order_id, branch, 'create', 'Menunggu Konfirmasi', 10, 'pending', strftime('%Y-%m-%dT%H:%M:%S', created_at, '+7 hours')
+            from shipments order by id""")
+        self.conn.execute("""insert into shipment_events (order_id, branch, kind, status, status_code, status_category, event_at)
+            select order_id, branch, 'status', status, status_code, status_category, last_updated
+            from shipments where status is not 'Menunggu Konfirmasi' order by id""")
+        self.conn.commit()
+
+    def _run(self, label, sql, params=(), write=False):
+        t0 = time.perf_counter()
+        ok, rows = False, []
+        try:
+            with self.lock:
+                cur = self.conn.execute(sql, params)
+                rows = [dict(r) for r in cur.fetchall()]
+                if write: self.conn.commit()
+            ok = True
+            return rows
+        finally:
+            db.STATS.record(label, (time.perf_counter() - t0) * 1000, ok, rows=len(rows))
+
+    @staticmethod
+    def _cols(columns):
+        if not columns: return "*"
+        bad = [c for c in columns if c not in COLUMNS]
+        if bad: raise ValueError(f"Kolom tidak dikenal: {bad}")
+        return ",".join(columns)
+
+    @staticmethod
+    def _where(conds):
+        return (" where " + " and ".join(conds)) if conds else ""
+
+    def get(self, order_id, columns=None, archived=False):
+        table = "shipments_archive" if archived else "shipments"
+        rows = self._run(f"{'archive' if archived else 'shipments'}.get",
+                         f"select {self._cols(columns)} from {table} where order_id = ? limit 1", (order_id,))
+        return rows[0] if rows else None
+
+    def get_many(self, order_ids, columns=None):
+        found = {}
+        for i in range(0, len(order_ids), ID_QUERY_CHUNK):
+            part = list(order_ids[i:i + ID_QUERY_CHUNK])
+            sql = f"select {self._cols(_with_order_id(columns))} from shipments where order_id in ({','.join('?' * len(part))})"
+            found.update((r["order_id"], r) for r in self._run("shipments.get_many", sql, part))
+        return [found[o] for o in order_ids if o in found]
+
+    def search_by_name(self, term, limit, columns=None, archived=False):
+        table = "shipments_archive" if archived else "shipments"
+        sql = (f"select {self._cols(columns)} from {table} where customer_name like ? escape '\\' "
+               "order by created_at desc limit ?")
+        return self._run(f"{'archive' if archived else 'shipments'}.search_name", sql, (f"%{like_escape(term)}%", limit))
+
+    @staticmethod
+    def _search(conds, params, search):
+        term = like_escape((search or "").strip())
+        if term: conds.append("(order_id like ? escape '\\' or customer_name like ? escape '\\')"); params += [f"%{term}%"] * 2
+
+    def count(self, branch=None, bucket=None, status=None, search=""):
+        conds, params = [], []
+        if branch: conds.append("branch = ?"); params.append(branch)
+        if bucket: conds.append("status_category = ?"); params.append(bucket)
+        if status: conds.append("status = ?"); params.append(status)
+        self._search(conds, params, search)
+        return self._run("shipments.count", "select count(*) as n from shipments" + self._where(conds), params)[0]["n"]
+
+    def list_bucket(self, branch, bucket, columns=None, search="", sort="created_at", desc=True, offset=0, limit=None):
+        conds, params = ["status_category = ?"], [bucket]
+        if branch: conds.append("branch = ?"); params.append(branch)
+        self._search(conds, params, search)
+        d = "desc" if desc else "asc"
+        sql = f"select {self._cols(columns)} from shipments{self._where(conds)} order by {_check_sort(sort)} {d}, id {d}"
+        if limit: sql += " limit ? offset ?"; params += [limit, offset]
+        return self._run("shipments.list_bucket", sql, params)
+
+    def iter_bucket(self, bucket, columns=None, branch=None, page_size=EXPORT_PAGE_SIZE):
+        last_id = 0
+        while True:
+            conds, params = ["status_category = ?", "id > ?"], [bucket, last_id]
+            if branch: conds.append("branch = ?"); params.append(branch)
+            sql = f"select {self._cols(_with_id(columns))} from shipments{self._where(conds)} order by id limit ?"
+            rows = self._run("shipments.bucket_page", sql, params + [page_size])
+            yield from rows
+            if len(rows) < page_size: break
+            last_id = rows[-1]["id"]
+
+    def list_recent(self, branch=None, statuses=None, columns=None, limit=None):
+        conds, params = [], []
+        if branch: conds.append("branch = ?"); params.append(branch)
+        if statuses:
+            conds.append(f"status in ({','.join('?' * len(statuses))})"); params += list(statuses)
+        sql = f"select {self._cols(columns)} from shipments{self._where(conds)} order by created_at desc"
+        if limit: sql += " limit ?"; params.append(limit)
+        return self._run("shipments.list_recent", sql, params)
+
+    def page(self, branch=None, search="", status=None, cursor=None, limit=50, columns=None):
+        conds, params = [], []
+        if branch: conds.append("branch = ?"); params.append(branch)
+        if status: conds.append("status = ?"); params.append(status)
+        self._search(conds, params, search)
+        if cursor:
+            conds.append("(created_at < ? or (created_at = ? and id < ?))"); params += [cursor[0], cursor[0], cursor[1]]
+        sql = f"select {self._cols(_with_cursor_cols(columns))} from shipments{self._where(conds)} order by created_at desc, id desc limit ?"
+        return _next_cursor(self._run("shipments.page", sql, params + [limit + 1]), limit)
+
+    def existing_ids(self, order_ids):
+        found = set()
+        for i in range(0, len(order_ids), ID_QUERY_CHUNK):
+            part = list(order_ids[i:i + ID_QUERY_CHUNK])
+            marks = ','.join('?' * len(part))
+            sql = (f"select order_id from shipments where order_id in ({marks}) "
+                   f"union select order_id from shipments_archive where order_id in ({marks})")
+            found.update(r["order_id"] for r in self._run("shipments.existing_ids", sql, part + part))
+        return found
+
+    def insert(self, rows):
+        rows = rows if isinstance(rows, list) else [rows]
+        if not rows: return []
+        now = utc_now_iso()
+        t0 = time.perf_counter()
+        ok = False
+        try:
+            with self.lock:
+                out = []
+                try:
+                    for r in rows:
+                        r = {k: v for k, v in r.items() if k in COLUMNS and k != "id"}
+                        r.setdefault("created_at", now)
+                        cur = self.conn.execute(
+                            f"insert into shipments ({','.join(r)}) values ({','.join('?' * len(r))})", list(r.values()))
+                        out.append(dict(r, id=cur.lastrowid))
+                    self.conn.commit()
+                except sqlite3.IntegrityError as e:
+                    # Satu batch = satu transaksi, sama seperti insert list di PostgREST
+                    self.conn.rollback()
+                    if "UNIQUE" in str(e): raise DuplicateOrderError(str(e)) from e
+                    raise
+            ok = True
+            return out
+        finally:
+            db.STATS.record("shipments.insert", (time.perf_counter() - t0) * 1000, ok, rows=len(rows))
+
+    def _set_clause(self, fields):
+        bad = [c for c in fields if c not in COLUMNS or c == "id"]
+        if bad: raise ValueError(f"Kolom tidak dikenal: {bad}")
+        return ",".join(f"{c} = ?" for c in fields)
+
+    def update(self, order_id, fields):
+        sql = f"update shipments set {self._set_clause(fields)} where order_id = ? returning *"
+        return self._run("shipments.update", sql, list(fields.values()) + [order_id], write=True)
+
+    def update_many(self, order_ids, fields):
+        ids = list(order_ids)
+        sql = (f"update shipments set {self._set_clause(fields)} "
+               f"where order_id in ({','.join('?' * len(ids))}) returning order_id")
+        return [r["order_id"] for r in self._run("shipments.update_many", sql, list(fields.values()) + ids, write=True)]
+
+    def delete(self, order_id):
+        self._run("shipments.delete", "delete from shipments where order_id = ?", (order_id,), write=True)
+
+    def delete_all(self):
+        self._run("shipments.delete_all", "delete from shipments", write=True)
+        self._run("archive.delete_all", "delete from shipments_archive", write=True)
+
+    def iter_export(self, branch=None, start=None, end=None, page_size=EXPORT_PAGE_SIZE, include_archive=False):
+        for table in (("shipments", "shipments_archive") if include_archive else ("shipments",)):
+            label = "archive.export_page" if table == "shipments_archive" else "shipments.export_page"
+            last_id = 0
+            while True:
+                conds, params = ["id > ?"], [last_id]
+                if branch: conds.append("branch = ?"); params.append(branch)
+                if start: conds.append("created_at >= ?"); params.append(_day_start_utc(start))
+                if end: conds.append("created_at < ?"); params.append(_end_exclusive(end))
+                sql = f"select {','.join(COLUMNS)} from {table}{self._where(conds)} order by id limit ?"
+                rows = self._run(label, sql, params + [page_size])
+                yield from rows
+                if len(rows) < page_size: break
+                last_id = rows[-1]["id"]
+
+    def archive_batch(self, before, limit=ARCHIVE_BATCH):
+        cols = ",".join(COLUMNS)
+        t0 = time.perf_counter()
+        ok, n = False, 0
+        try:
+            with self.lock:
+                ids = [r["id"] for r in self.conn.execute(
+                    "select id from shipments where status_category = 'done' and last_updated < ? order by id limit ?", (before, limit))]
+                if ids:
+                    marks = ",".join("?" * len(ids))
+                    try:
+                        # Salin dulu, baru hapus: trigger hapus mencatat event 'archive', bukan 'delete'
+                        self.conn.execute(f"insert into shipments_archive ({cols}, archived_at) "
+                                          f"select {cols}, ? from shipments where id in ({marks})", [utc_now_iso()] + ids)
+                        n = self.conn.execute(f"delete from shipments where id in ({marks})", ids).rowcount
+                        self.conn.commit()
+                    except Exception:
+                        self.conn.rollback()
+                        raise
+            ok = True
+            return n
+        finally:
+            db.STATS.record("shipments.archive", (time.perf_counter() - t0) * 1000, ok, rows=n)
+
+    def count_archive(self):
+        return self._run("archive.count", "select count(*) as n from shipments_archive")[0]["n"]
+
+    def events_since(self, after_id=0, limit=EVENT_PAGE_SIZE):
+        sql = f"select {','.join(EVENT_COLUMNS)} from shipment_events where id > ? order by id limit ?"
+        return self._run("events.since", sql, (after_id, limit))
+
+    def latest_event_id(self):
+        return self._run("events.latest", "select coalesce(max(id), 0) as n from shipment_events")[0]["n"]
+
+
+def from_env():
+    """Repository untuk skrip di luar Streamlit (job arsip, layanan lacak), dari env ``DELIVERY_*`` / ``SUPABASE_*``."""
+    if os.environ.get("DELIVERY_BACKEND", "supabase") == "sqlite":
+        return SQLiteRepository(os.environ.get("DELIVERY_SQLITE_PATH", ":memory:"))
+    return SupabaseRepository(db.make_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_KEY"]))
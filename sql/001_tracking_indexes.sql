@@ -0,0 +1,11 @@
+-- Index untuk halaman Cek Resi (tracking.py).
+-- Jalankan sekali di Supabase SQL Editor.
+
+-- Lookup order_id persis (juga untuk scan QR ?oid=).
+-- Lewati baris ini bila order_id sudah punya constraint UNIQUE.
+create unique index if not exists shipments_order_id_idx on shipments (order_id);
+
+-- Pencarian nama customer: ILIKE '%nama%' hanya bisa memakai index trigram.
+create extension if not exists pg_trgm;
+create index if not exists shipments_customer_name_trgm_idx
+    on shipments using gin (customer_name gin_trgm_ops);
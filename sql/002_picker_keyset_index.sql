@@ -0,0 +1,8 @@
+-- Index keyset pagination picker Update Status (orders.fetch_order_page).
+-- ORDER BY created_at DESC, id DESC dengan/ tanpa filter cabang.
+create index if not exists shipments_created_id_idx on shipments (created_at desc, id desc);
+create index if not exists shipments_branch_created_id_idx on shipments (branch, created_at desc, id desc);
+
+-- Pencarian order_id sebagian (ILIKE '%..%') di picker.
+create index if not exists shipments_order_id_trgm_idx
+    on shipments using gin (order_id gin_trgm_ops);
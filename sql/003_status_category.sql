@@ -0,0 +1,23 @@
+-- Model status canonical (status_model.py): kategori & kode disimpan di baris.
+-- Jalankan sekali; aman diulang.
+
+alter table shipments add column if not exists status_code smallint not null default 0;
+alter table shipments add column if not exists status_category text not null default 'pending';
+
+-- Migrasi data lama: aturan sama dengan status_model.classify / STATUS_CODES
+update shipments set
+    status_code = case status
+        when 'Menunggu Konfirmasi' then 10
+        when 'Diproses Gudang' then 20
+        when 'Menunggu Kurir' then 30
+        when 'Dalam Pengiriman' then 40
+        when 'Selesai/Diterima' then 50
+        else 0 end,
+    status_category = case
+        when status ilike any (array['%selesai%', '%diterima%']) then 'done'
+        when status ilike any (array['%dikirim%', '%jalan%', '%pengiriman%']) then 'shipping'
+        else 'pending' end;
+
+-- Hitungan & daftar bucket dashboard per cabang
+create index if not exists shipments_branch_category_idx on shipments (branch, status_category, created_at desc);
+create index if not exists shipments_category_idx on shipments (status_category, created_at desc);
@@ -0,0 +1,52 @@
+-- Riwayat status append-only. Setiap insert, perubahan status dan hapus di shipments
+-- dicatat trigger, jadi semua jalur tulis (input satuan, upload massal, update massal) ikut.
+-- Dibaca inkremental (id > watermark) oleh analytics.py. Jalankan sekali; aman diulang.
+
+create table if not exists shipment_events (
+    id bigint generated always as identity primary key,
+    order_id text not null,
+    branch text,
+    kind text not null,            -- 'create' | 'status' | 'delete'
+    status text,
+    status_code smallint,
+    status_category text,
+    event_at text,                 -- waktu fakta lapangan (last_updated, WIB)
+    recorded_at timestamptz not null default now()
+);
+create index if not exists shipment_events_order_idx on shipment_events (order_id, id);
+
+create or replace function record_shipment_event() returns trigger language plpgsql as $$
+begin
+    if tg_op = 'INSERT' then
+        insert into shipment_events (order_id, branch, kind, status, status_code, status_category, event_at)
+        values (new.order_id, new.branch, 'create', new.status, new.status_code, new.status_category, new.last_updated);
+    elsif tg_op = 'UPDATE' then
+        if new.status is distinct from old.status then
+            insert into shipment_events (order_id, branch, kind, status, status_code, status_category, event_at)
+            values (new.order_id, new.branch, 'status', new.status, new.status_code, new.status_category, new.last_updated);
+        end if;
+    else
+        insert into shipment_events (order_id, branch, kind, status, status_code, status_category)
+        values (old.order_id, old.branch, 'delete', old.status, old.status_code, old.status_category);
+        return old;
+    end if;
+    return new;
+end $$;
+
+drop trigger if exists shipments_status_event on shipments;
+create trigger shipments_status_event after insert or update of status or delete on shipments
+    for each row execute function record_shipment_event();
+
+-- Data lama (hanya bila tabel event masih kosong): 'create' dari created_at (WIB)
+-- + status terakhir bila order sudah bergerak
+insert into shipment_events (order_id, branch, kind, status, status_code, status_category, event_at)
+select order_id, branch, kind, status, status_code, status_category, event_at from (
+    select id, 0 as step, order_id, branch, 'create' as kind, 'Menunggu Konfirmasi' as status, 10::smallint as status_code,
+           'pending' as status_category, to_char(created_at at time zone 'Asia/Jakarta', 'YYYY-MM-DD"T"HH24:MI:SS') as event_at
+    from shipments
+    union all
+    select id, 1, order_id, branch, 'status', status, status_code, status_category, last_updated::text
+    from shipments where status is distinct from 'Menunggu Konfirmasi'
+) seed
+where not exists (select 1 from shipment_events)
+order by id, step;
@@ -0,0 +1,54 @@
+-- Pemisahan tabel aktif / arsip. Order selesai lebih dari N hari dipindah ke shipments_archive
+-- per batch (archive.py / menu Manajemen Data > Arsip); halaman operasional hanya membaca
+-- shipments, Cek Resi & export membaca arsip bila diminta. Jalankan sekali; aman diulang.
+
+-- Kolom sama persis dengan shipments (urutan dipakai insert ... select di bawah) + archived_at.
+-- Bila shipments nanti dapat kolom baru, tambahkan juga di sini sebelum archive_shipments dipakai lagi.
+create table if not exists shipments_archive (like shipments including defaults);
+alter table shipments_archive add column if not exists archived_at timestamptz not null default now();
+
+create unique index if not exists shipments_archive_order_id_key on shipments_archive (order_id);
+create index if not exists shipments_archive_branch_created_idx on shipments_archive (branch, created_at desc, id desc);
+create index if not exists shipments_archive_customer_name_trgm_idx on shipments_archive using gin (customer_name gin_trgm_ops);
+
+-- Index kandidat arsip
+create index if not exists shipments_done_updated_idx on shipments (last_updated) where status_category = 'done';
+
+-- Satu batch = satu transaksi: salin ke arsip lalu hapus dari shipments
+create or replace function archive_shipments(cutoff text, batch_size int default 500) returns int
+language plpgsql as $$
+declare n int;
+begin
+    with batch as (
+        select id from shipments
+        where status_category = 'done' and last_updated::timestamp < cutoff::timestamp
+        order by id limit batch_size
+        for update skip locked
+    ), moved as (
+        delete from shipments s using batch b where s.id = b.id returning s.*
+    )
+    insert into shipments_archive select m.*, now() from moved m;
+    get diagnostics n = row_count;
+    return n;
+end $$;
+
+-- Event riwayat (004): hapus karena diarsipkan dicatat 'archive', bukan 'delete'
+create or replace function record_shipment_event() returns trigger language plpgsql as $$
+begin
+    if tg_op = 'INSERT' then
+        insert into shipment_events (order_id, branch, kind, status, status_code, status_category, event_at)
+        values (new.order_id, new.branch, 'create', new.status, new.status_code, new.status_category, new.last_updated);
+    elsif tg_op = 'UPDATE' then
+        if new.status is distinct from old.status then
+            insert into shipment_events (order_id, branch, kind, status, status_code, status_category, event_at)
+            values (new.order_id, new.branch, 'status', new.status, new.status_code, new.status_category, new.last_updated);
+        end if;
+    else
+        insert into shipment_events (order_id, branch, kind, status, status_code, status_category)
+        values (old.order_id, old.branch,
+                case when exists (select 1 from shipments_archive a where a.order_id = old.order_id) then 'archive' else 'delete' end,
+                old.status, old.status_code, old.status_category);
+        return old;
+    end if;
+    return new;
+end $$;
@@ -0,0 +1,5 @@
+-- Index tabel bucket dashboard yang dipaginasi di server (repository.list_bucket).
+-- Urutan "terakhir update" per bucket, dengan / tanpa filter cabang; urutan dibuat
+-- (created_at) sudah tercakup index 003, urutan order_id memakai index unik 001.
+create index if not exists shipments_branch_category_updated_idx on shipments (branch, status_category, last_updated desc, id desc);
+create index if not exists shipments_category_updated_idx on shipments (status_category, last_updated desc, id desc);
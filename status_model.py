@@ -0,0 +1,46 @@
+# Model status canonical. Kategori & kode status dihitung sekali saat order ditulis
+# (status_category, status_code di tabel shipments), jadi dashboard dan Cek Resi cukup
+# membandingkan nilai tersimpan, bukan mencocokkan substring teks status tiap rerun.
+
+PENDING, SHIPPING, DONE = "pending", "shipping", "done"
+CATEGORIES = [PENDING, SHIPPING, DONE]
+
+# Urutan = alur kerja gudang; kode dipakai untuk urutan & perbandingan
+STATUS_CODES = {
+    "Menunggu Konfirmasi": 10,
+    "Diproses Gudang": 20,
+    "Menunggu Kurir": 30,
+    "Dalam Pengiriman": 40,
+    "Selesai/Diterima": 50,
+}
+STATUS_OPTIONS = list(STATUS_CODES)
+UNKNOWN_CODE = 0
+
+# Aturan kata kunci lama, hanya dipakai untuk status teks bebas / data sebelum migrasi
+DONE_KEYWORDS = ["selesai", "diterima"]
+SHIP_KEYWORDS = ["dikirim", "jalan", "pengiriman"]
+
+COLORS = {DONE: "success", SHIPPING: "info", PENDING: "warning"}
+
+def classify(status):
+    s = str(status or "").lower()
+    if any(k in s for k in DONE_KEYWORDS): return DONE
+    if any(k in s for k in SHIP_KEYWORDS): return SHIPPING
+    return PENDING
+
+def status_fields(status):
+    """Field yang ditulis bersama setiap perubahan status."""
+    return {"status": status, "status_code": STATUS_CODES.get(status, UNKNOWN_CODE), "status_category": classify(status)}
+
+def category_of(row):
+    # Baris lama yang belum termigrasi jatuh ke aturan kata kunci
+    return row.get("status_category") or classify(row.get("status"))
+
+def color_of(row):
+    return COLORS[category_of(row)]
+
+def option_index(row):
+    """Posisi status baris di STATUS_OPTIONS (0 bila status tidak dikenal)."""
+    code = row.get("status_code") or STATUS_CODES.get(row.get("status"), UNKNOWN_CODE)
+    codes = list(STATUS_CODES.values())
+    return codes.index(code) if code in codes else 0
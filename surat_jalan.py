@@ -0,0 +1,226 @@
+# Surat Jalan thermal 80mm: cetak satuan dan cetak batch (banyak order, satu PDF).
+# QR digambar langsung sebagai kotak vektor dari matrix qrcode, tanpa file PNG sementara.
+
+import hashlib
+import json
+from functools import lru_cache
+
+import qrcode
+from fpdf import FPDF
+
+import perf
+
+PAGE_FORMAT = (80, 250)
+MARGIN = 4
+W_FULL = 72
+QR_SIZE = 30
+QR_QUIET = 4          # quiet zone (modul) seperti border default qrcode.make
+QR_MASK = 0
+SIGN_COL = 36         # lebar kolom tanda tangan Sales / Penerima
+
+# Field order yang tercetak di Surat Jalan; hash-nya jadi kunci PdfCache
+NOTE_FIELDS = ["order_id", "branch", "sales_name", "sales_phone", "customer_name", "customer_phone",
+               "delivery_address", "product_name", "delivery_type", "old_product_name",
+               "installation_opt", "installation_fee"]
+
+def note_hash(data):
+    raw = json.dumps([data.get(k) for k in NOTE_FIELDS], ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+def safe_text(text):
+    if not text: return "-"
+    return str(text).encode('latin-1', 'replace').decode('latin-1')
+
+@lru_cache(maxsize=1024)
+def qr_matrix(url):
+    # Mask tetap: mencoba 8 mask untuk skor terbaik memakan ~75% waktu membuat QR, dan mask
+    # mana pun sah menurut spesifikasi (tercatat di format info, dibaca scanner)
+    qr = qrcode.QRCode(border=0, mask_pattern=QR_MASK)
+    qr.add_data(url)
+    qr.make(fit=True)
+    return tuple(tuple(row) for row in qr.get_matrix())
+
+def tracking_url(base_url, order_id):
+    return f"{base_url}/?oid={order_id}"
+
+def new_document():
+    # Pengaturan dokumen (format, margin, font core) cukup sekali per batch
+    pdf = FPDF(orientation='P', unit='mm', format=PAGE_FORMAT)
+    pdf.set_margins(MARGIN, MARGIN, MARGIN)
+    return pdf
+
+def draw_line(pdf):
+    pdf.ln(2)
+    y = pdf.get_y()
+    pdf.line(MARGIN, y, MARGIN + W_FULL, y)
+    pdf.ln(2)
+
+def draw_qr(pdf, matrix, x, y, size=QR_SIZE):
+    # Operator PDF ditulis langsung: satu path untuk semua modul, bukan satu rect() per modul
+    cell = size / (len(matrix) + 2 * QR_QUIET)
+    k, top = pdf.k, pdf.h
+    ops = []
+    for r, row in enumerate(matrix):
+        c = 0
+        while c < len(row):
+            if not row[c]: c += 1; continue
+            # Modul hitam yang berurutan digabung jadi satu persegi panjang
+            start = c
+            while c < len(row) and row[c]: c += 1
+            ops.append(f"{(x + (QR_QUIET + start) * cell) * k:.2f} {(top - y - (QR_QUIET + r) * cell) * k:.2f} "
+                       f"{(c - start) * cell * k:.2f} {-cell * k:.2f} re")
+    pdf.set_fill_color(0)
+    pdf._out("\n".join(ops) + "\nf")
+    pdf.set_y(y + size)
+
+
+class NoteTemplate:
+    """Bagian statis Surat Jalan (judul, label, garis) untuk satu dokumen.
+
+    Tiap blok digambar sekali; halaman berikutnya menempel ulang operator PDF blok itu,
+    digeser ke posisi y halaman tersebut. Isi per order digambar terpisah.
+    """
+
+    def __init__(self, pdf):
+        self.pdf = pdf
+        self.blocks = {}
+
+    def place(self, name, draw):
+        """Gambar / tempel blok ``name`` di posisi y sekarang; kembalikan y awal blok."""
+        pdf = self.pdf
+        y = pdf.get_y()
+        blk = self.blocks.get(name)
+        if blk is None:
+            start = len(pdf.pages[pdf.page])
+            draw()
+            self.blocks[name] = (pdf.pages[pdf.page][start:], y, pdf.get_y() - y)
+        else:
+            ops, y0, height = blk
+            # q/Q mengembalikan font & warna, jadi state FPDF tetap cocok dengan isi halaman
+            pdf._out(f"q 1 0 0 1 0 {(y0 - y) * pdf.k:.2f} cm\n{ops}Q")
+            pdf.set_y(y + height)
+        return y
+
+def _head_block(pdf, print_timestamp):
+    pdf.set_font("Arial", 'B', 16)
+    pdf.set_x(0)
+    pdf.cell(80, 8, "SURAT JALAN", 0, 1, 'C')
+    pdf.set_x(MARGIN)
+    draw_line(pdf)
+    pdf.set_font("Arial", '', 10)
+    pdf.cell(20, 5, "No Order", 0, 1)
+    # Waktu cetak sama untuk semua order di satu dokumen
+    pdf.cell(20, 5, "Tanggal", 0, 0)
+    pdf.cell(52, 5, f": {print_timestamp.strftime('%d/%m/%Y %H:%M')}", 0, 1)
+    draw_line(pdf)
+    pdf.set_font("Arial", 'B', 11)
+    pdf.cell(W_FULL, 6, "PENERIMA:", 0, 1)
+
+def _sales_block(pdf):
+    draw_line(pdf)
+    pdf.set_font("Arial", 'B', 11)
+    pdf.cell(W_FULL, 6, "SALES:", 0, 1)
+    pdf.set_font("Arial", '', 10)
+    pdf.cell(15, 5, "Nama", 0, 1)
+    pdf.cell(15, 5, "HP", 0, 1)
+    draw_line(pdf)
+    pdf.set_font("Arial", 'B', 12)
+    pdf.cell(W_FULL, 8, "BARANG:", 0, 1)
+
+def _sign_block(pdf):
+    draw_line(pdf)
+    pdf.ln(5)
+    y_start = pdf.get_y()
+    pdf.set_font("Arial", '', 10)
+    pdf.set_xy(MARGIN, y_start)
+    pdf.cell(SIGN_COL, 5, "Sales,", 0, 0, 'C')
+    pdf.set_xy(MARGIN + SIGN_COL, y_start)
+    pdf.cell(SIGN_COL, 5, "Penerima,", 0, 1, 'C')
+    pdf.ln(20)
+
+def _scan_block(pdf):
+    pdf.ln(2)
+    pdf.set_x(0)
+    pdf.set_font("Arial", 'B', 10)
+    pdf.cell(80, 5, "SCAN UNTUK TRACKING", 0, 1, 'C')
+
+def add_note(pdf, data, print_timestamp, base_url, tpl=None):
+    tpl = tpl or NoteTemplate(pdf)
+    pdf.add_page()
+
+    # HEADER + label No Order / Tanggal (statis); nilai No Order di kolom kanan baris pertama label
+    y = tpl.place("head", lambda: _head_block(pdf, print_timestamp))
+    y_end = pdf.get_y()
+    pdf.set_font("Arial", 'B', 11)
+    pdf.set_xy(MARGIN + 20, y + 12)
+    pdf.cell(52, 5, f": {safe_text(data['order_id'])}", 0, 1)
+    pdf.set_y(y_end)
+
+    # PENERIMA
+    pdf.set_font("Arial", 'B', 12)
+    pdf.multi_cell(W_FULL, 6, safe_text(data['customer_name']))
+    pdf.set_font("Arial", '', 11)
+    pdf.cell(W_FULL, 6, f"HP: {safe_text(data['customer_phone'])}", 0, 1)
+    pdf.ln(1)
+    pdf.multi_cell(W_FULL, 5, safe_text(data['delivery_address']))
+
+    # SALES (Label: SALES, Kontak: HP) + judul BARANG
+    y = tpl.place("sales", lambda: _sales_block(pdf))
+    y_end = pdf.get_y()
+    pdf.set_font("Arial", '', 10)
+    pdf.set_xy(MARGIN + 15, y + 10)
+    pdf.cell(57, 5, f": {safe_text(data['sales_name'])} ({safe_text(data['branch'])})", 0, 1)
+    pdf.set_x(MARGIN + 15)
+    pdf.cell(57, 5, f": {safe_text(data.get('sales_phone', '-'))}", 0, 1)
+    pdf.set_y(y_end)
+
+    # BARANG
+    pdf.set_font("Arial", 'B', 11)
+    pdf.multi_cell(W_FULL, 6, f"- {safe_text(data['product_name'])}")
+    pdf.ln(2)
+    pdf.set_font("Arial", '', 10)
+    pdf.cell(25, 5, "Tipe Kirim", 0, 0)
+    pdf.cell(47, 5, f": {safe_text(data['delivery_type'])}", 0, 1)
+
+    if data['delivery_type'] == "Tukar Tambah" and data.get('old_product_name'):
+        pdf.set_font("Arial", 'I', 9)
+        pdf.cell(25, 5, "Brg Lama", 0, 0)
+        pdf.multi_cell(47, 5, f": {safe_text(data.get('old_product_name'))}")
+        pdf.set_font("Arial", '', 10)
+
+    if data.get('installation_opt') == "Ya - Vendor":
+        pdf.cell(25, 5, "Instalasi", 0, 0)
+        pdf.cell(47, 5, f": YA (Vendor)", 0, 1)
+        pdf.cell(25, 5, "Biaya", 0, 0)
+        pdf.cell(47, 5, f": Rp {safe_text(data.get('installation_fee', '-'))}", 0, 1)
+
+    # TTD (Sales & Penerima)
+    tpl.place("sign", lambda: _sign_block(pdf))
+    y_end = pdf.get_y()
+    pdf.set_font("Arial", 'B', 10)
+    pdf.set_xy(MARGIN, y_end)
+    pdf.cell(SIGN_COL, 5, f"({safe_text(data['sales_name'])})", 0, 0, 'C')
+    pdf.set_xy(MARGIN + SIGN_COL, y_end)
+    pdf.cell(SIGN_COL, 5, f"({safe_text(data['customer_name'])})", 0, 1, 'C')
+    pdf.ln(8)
+
+    # QR CODE
+    matrix = qr_matrix(tracking_url(base_url, data['order_id']))
+    draw_qr(pdf, matrix, MARGIN + (W_FULL - QR_SIZE) / 2, pdf.get_y())
+    tpl.place("scan", lambda: _scan_block(pdf))
+
+def create_thermal_pdf(data, print_timestamp, base_url):
+    with perf.timer("pdf", "single") as t:
+        pdf = new_document()
+        add_note(pdf, data, print_timestamp, base_url)
+        t["rows"] = 1
+        return pdf.output(dest='S').encode('latin-1')
+
+def create_batch_pdf(orders, print_timestamp, base_url):
+    """Satu PDF multi-halaman, satu halaman 80mm per order; bagian statis disusun sekali per dokumen."""
+    with perf.timer("pdf", "batch") as t:
+        t["rows"] = len(orders)
+        pdf = new_document()
+        tpl = NoteTemplate(pdf)
+        for data in orders: add_note(pdf, data, print_timestamp, base_url, tpl)
+        return pdf.output(dest='S').encode('latin-1')
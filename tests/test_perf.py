@@ -0,0 +1,13 @@
+from perf import percentile
+
+
+def test_percentile_nearest_rank():
+    assert percentile([1, 2], 50) == 1
+    assert percentile(list(range(1, 7)), 50) == 3
+    assert percentile(list(range(1, 11)), 90) == 9
+    assert percentile(list(range(1, 11)), 95) == 10
+    assert percentile(list(range(1, 101)), 99) == 99
+    assert percentile([5], 50) == 5
+    assert percentile([3, 7], 0) == 3
+    assert percentile([3, 7], 100) == 7
+    assert percentile([], 50) == 0.0
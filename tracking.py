@@ -0,0 +1,45 @@
+# Mesin pencarian halaman Cek Resi (publik).
+# Urutan: lookup order_id persis (index unik) -> cari nama (index trigram).
+# Input user tidak pernah disisipkan ke string filter PostgREST.
+
+import re
+
+from cache import QueryCache
+
+MIN_NAME_QUERY = 3   # pg_trgm butuh minimal 3 karakter agar index terpakai
+MAX_RESULTS = 10
+# Kolom yang tampil di kartu hasil (tanpa alamat / no HP customer)
+TRACK_COLUMNS = ["order_id", "branch", "customer_name", "product_name", "delivery_type", "old_product_name",
+                 "installation_opt", "installation_fee", "courier", "resi", "status", "status_category",
+                 "created_at", "last_updated"]
+
+def normalize_query(q):
+    return re.sub(r"\s+", " ", str(q or "")).strip()
+
+def lookup(repo, cache, q, exact_only=False, include_archive=False):
+    """Cari pengiriman untuk input Cek Resi.
+
+    Mengembalikan ``(rows, hint)``; ``hint`` bernilai ``"too_short"`` bila
+    tidak ada order_id yang cocok dan nama terlalu pendek untuk dicari.
+    Scan QR (``?oid=``) memakai ``exact_only=True`` sehingga tidak pernah
+    jatuh ke pencarian nama. Dengan ``include_archive=True`` tabel arsip
+    hanya dibaca bila tabel aktif tidak memberi hasil (cukup).
+    """
+    q = normalize_query(q)
+    if not q: return [], None
+
+    rows = cache.get_or_load(QueryCache.make_key("track_oid", term=q), lambda: [r for r in [repo.get(q, TRACK_COLUMNS)] if r])
+    if not rows and include_archive:
+        rows = cache.get_or_load(QueryCache.make_key("track_oid", bucket="archive", term=q),
+                                 lambda: [r for r in [repo.get(q, TRACK_COLUMNS, archived=True)] if r])
+    if rows or exact_only: return rows, None
+
+    # Wildcard di-escape oleh repository; * (wildcard PostgREST) dibuang di sana, jadi tidak ikut dihitung
+    term = q.replace("*", "").casefold()
+    if len(term) < MIN_NAME_QUERY: return [], "too_short"
+    rows = cache.get_or_load(QueryCache.make_key("track_name", term=term), lambda: repo.search_by_name(term, MAX_RESULTS, TRACK_COLUMNS))
+    if len(rows) < MAX_RESULTS and include_archive:
+        rest = MAX_RESULTS - len(rows)
+        rows = rows + cache.get_or_load(QueryCache.make_key("track_name", bucket="archive", term=term, page=rest),
+                                        lambda: repo.search_by_name(term, rest, TRACK_COLUMNS, archived=True))
+    return rows, None
@@ -0,0 +1,137 @@
+# Layanan lacak ringan untuk scan QR Surat Jalan, terpisah dari aplikasi Streamlit.
+# Satu scan = satu request HTTP biasa (tanpa websocket / sesi / sidebar). Isinya sama dengan
+# kartu hasil di Cek Resi, diambil lewat tracking.lookup dengan cache TTL pendek; scan
+# bersamaan untuk order yang sama digabung menjadi satu query (QueryCache).
+#
+#   python tracking_server.py --port 8080                          # Supabase (SUPABASE_URL / SUPABASE_KEY)
+#   DELIVERY_BACKEND=sqlite DELIVERY_SQLITE_PATH=delivery.db python tracking_server.py
+#
+#   GET /?oid=SO-001          halaman HTML (format URL QR sama dengan aplikasi)
+#   GET /api/track?oid=SO-001 JSON
+#   GET /healthz              status + statistik cache
+
+import argparse
+import html
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import db
+import repository
+import status_model
+import tracking
+from cache import QueryCache
+
+TRACK_TTL = 15          # detik; status order jarang berubah dalam hitungan detik
+CACHE_MAXSIZE = 4096    # order berbeda yang disimpan
+# Aplikasi lengkap (tautan "cari order lain"); sama dengan APP_BASE_URL di common.py
+APP_BASE_URL = os.environ.get("DELIVERY_APP_URL", "https://delivery-tracker.streamlit.app")
+PUBLIC_FIELDS = ["order_id", "branch", "customer_name", "product_name", "status", "courier", "resi",
+                 "delivery_type", "old_product_name", "installation_opt", "installation_fee"]
+ICONS = {"success": "✅", "info": "🚚", "warning": "⏳"}
+
+def public_view(d):
+    """Field yang juga tampil di halaman Cek Resi."""
+    out = {k: d.get(k) for k in PUBLIC_FIELDS}
+    out["category"] = status_model.category_of(d)
+    out["updated"] = str(d.get("last_updated") or d.get("created_at") or "")[:16].replace("T", " ")
+    return out
+
+def render_html(v):
+    e = lambda x: html.escape(str(x or "-"))
+    color = status_model.COLORS[v["category"]]
+    extra = ""
+    if v["delivery_type"] == "Tukar Tambah" and v["old_product_name"]: extra += f"<li>🔄 <b>Tukar Tambah:</b> {e(v['old_product_name'])}</li>"
+    if v["installation_opt"] == "Ya - Vendor": extra += f"<li>🔧 <b>Instalasi:</b> Ya (Vendor) - Biaya: {e(v['installation_fee'])}</li>"
+    return f"""<h2 class="{color}">{ICONS[color]} Status: {e(v['status'])}</h2>
+<h3>{e(v['product_name'])}</h3>
+<ul>
+<li>🏢 Cabang: <b>{e(v['branch'])}</b></li>
+<li>👤 Customer: <b>{e(v['customer_name'])}</b></li>
+<li>🔢 Order ID: <code>{e(v['order_id'])}</code></li>
+<li>🚚 Kurir: {e(v['courier'])}</li>
+<li>🔖 Resi: {e(v['resi'])}</li>
+{extra}<li>🕒 <b>Update:</b> {e(v['updated'])}</li>
+</ul>"""
+
+PAGE = """<!doctype html>
+<html lang="id"><head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Lacak Pengiriman</title>
+<style>
+body {{ font-family: sans-serif; max-width: 560px; margin: 1.5em auto; padding: 0 1em; color: #222; }}
+h2 {{ padding: .6em .8em; border-radius: 6px; font-size: 1.1em; }}
+.success {{ background: #e6f4ea; }} .info {{ background: #e3f2fd; }} .warning {{ background: #fff8e1; }}
+li {{ margin: .3em 0; }} a {{ color: #0095DA; }}
+</style></head>
+<body><h1>🔍 Lacak Pengiriman</h1>
+{body}
+<p><a href="{app}">Cari order lain</a></p></body></html>"""
+
+
+class TrackingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive untuk klien yang memakai ulang koneksi
+    disable_nagle_algorithm = True  # header & body ditulis terpisah; tanpa ini tiap respons tertahan ~40 ms
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        oid = tracking.normalize_query(parse_qs(url.query).get("oid", [""])[0])
+        if url.path == "/healthz": return self._send(200, "application/json", json.dumps({"ok": True, "cache": self.server.cache.stats()}))
+        if url.path not in ("/", "/api/track"): return self._send(404, "text/plain; charset=utf-8", "Not found")
+        api = url.path == "/api/track"
+        if not oid:
+            if api: return self._send(400, "application/json", json.dumps({"error": "parameter oid wajib diisi"}))
+            return self._send(302, "text/plain; charset=utf-8", "", {"Location": APP_BASE_URL})
+        try: d = self.server.lookup(oid)
+        except Exception as e:
+            msg = db.describe_error(e)
+            if api: return self._send(503, "application/json", json.dumps({"error": msg}))
+            return self._send(503, "text/html; charset=utf-8", PAGE.format(body=f"<p>Terjadi kesalahan koneksi. {html.escape(msg)}</p>", app=APP_BASE_URL))
+        v = public_view(d) if d else None
+        headers = {"Cache-Control": f"public, max-age={self.server.ttl}"}
+        if api: return self._send(200 if v else 404, "application/json", json.dumps({"found": bool(v), "order": v}), headers)
+        body = render_html(v) if v else "<p>Data tidak ditemukan.</p>"
+        self._send(200 if v else 404, "text/html; charset=utf-8", PAGE.format(body=body, app=APP_BASE_URL), headers)
+
+    def _send(self, code, ctype, body, headers=None):
+        raw = body.encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(raw)))
+        for k, v in (headers or {}).items(): self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose: super().log_message(fmt, *args)
+
+
+class TrackingServer(ThreadingHTTPServer):
+    """Server lacak: satu thread per koneksi, satu repository + QueryCache bersama."""
+
+    daemon_threads = True
+
+    def __init__(self, addr, repo, ttl=TRACK_TTL, verbose=False):
+        super().__init__(addr, TrackingHandler)
+        self.repo = repo
+        self.ttl = ttl
+        self.cache = QueryCache(ttl=ttl, maxsize=CACHE_MAXSIZE)
+        self.verbose = verbose
+
+    def lookup(self, oid):
+        # Sama seperti scan QR di Cek Resi: order_id persis saja, termasuk arsip
+        rows, _ = tracking.lookup(self.repo, self.cache, oid, exact_only=True, include_archive=True)
+        return rows[0] if rows else None
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Layanan lacak ringan untuk scan QR Surat Jalan.")
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("--ttl", type=int, default=TRACK_TTL)
+    ap.add_argument("--verbose", action="store_true", help="log setiap request ke stderr")
+    args = ap.parse_args()
+    srv = TrackingServer((args.host, args.port), repository.from_env(), args.ttl, args.verbose)
+    print(f"Layanan lacak di http://{args.host}:{args.port}/?oid=...")
+    try: srv.serve_forever()
+    except KeyboardInterrupt: pass
@@ -0,0 +1,19 @@
+# Satu modul per halaman, masing-masing dengan fungsi render().
+# Modul halaman baru di-import saat halaman itu pertama kali dibuka, jadi dependensi berat
+# (pandas, fpdf/qrcode, xlsxwriter) hanya dimuat oleh proses yang benar-benar membukanya.
+
+import importlib
+
+PAGES = {
+    "🔍 Cek Resi (Public)": "cek_resi",
+    "🔐 Login Staff": "login",
+    "📊 Dashboard Monitoring": "dashboard",
+    "📝 Input Delivery Order": "input_order",
+    "⚙️ Update Status (Admin)": "update_status",
+    "⚙️ Update Status (SPV)": "update_status",
+    "🗄️ Manajemen Data": "manajemen",
+    "📈 Performance": "performance",
+}
+
+def render(menu):
+    importlib.import_module(f"{__name__}.{PAGES[menu]}").render()
@@ -0,0 +1,60 @@
+# Halaman Cek Resi (publik, landing page). Tidak memuat pandas / PDF / Excel.
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+import db
+import status_model
+import tracking
+from common import repo, qcache
+
+def render():
+    st.title("🔍 Lacak Pengiriman")
+    st.markdown("Masukkan Nomor Order ID atau Nama Anda untuk melacak status barang.")
+
+    default_oid = st.query_params.get("oid", "")
+    q = st.text_input("Order ID / Nama Customer:", value=default_oid)
+    auto_click = True if default_oid else False
+
+    if st.button("Lacak Paket") or q or auto_click:
+        if q:
+            try:
+                # Scan QR: hanya lookup order_id, tanpa pencarian nama
+                found, hint = tracking.lookup(repo, qcache, q, exact_only=bool(default_oid) and q == default_oid, include_archive=True)
+                if found:
+                    if len(found) >= tracking.MAX_RESULTS: st.caption(f"Menampilkan {tracking.MAX_RESULTS} hasil terbaru. Perjelas nama untuk hasil lain.")
+                    for d in found:
+                        col = status_model.color_of(d)
+                        if col=="success": st.success(f"Status: {d['status']}", icon="✅")
+                        elif col=="info": st.info(f"Status: {d['status']}", icon="🚚")
+                        else: st.warning(f"Status: {d['status']}", icon="⏳")
+
+                        tgl = d.get('last_updated') or d['created_at']
+                        install_info = ""
+                        if d.get('installation_opt') == "Ya - Vendor":
+                            install_info = f"* 🔧 **Instalasi:** Ya (Vendor) - Biaya: {d.get('installation_fee')}"
+
+                        old_item_info = ""
+                        if d.get('delivery_type') == "Tukar Tambah" and d.get('old_product_name'):
+                            old_item_info = f"* 🔄 **Tukar Tambah:** {d.get('old_product_name')}"
+
+                        st.markdown(f"""
+                        ### {d['product_name']}
+                        * 🏢 Cabang: **{d.get('branch', '-')}**
+                        * 👤 Customer: **{d['customer_name']}**
+                        * 🔢 Order ID: `{d['order_id']}`
+                        * 🚚 Kurir: {d['courier'] or '-'}
+                        * 🔖 Resi: {d['resi'] or '-'}
+                        {old_item_info}
+                        {install_info}
+                        * 🕒 **Update:** {tgl[:16].replace('T',' ')}
+                        """)
+                        st.divider()
+
+                        if d['resi'] and status_model.category_of(d) == status_model.SHIPPING:
+                             with st.expander("🌍 Lacak di Website PT. BES"):
+                                components.iframe("https://www.bes-paket.com/track-package", height=500, scrolling=True)
+
+                elif hint == "too_short": st.info(f"Ketik minimal {tracking.MIN_NAME_QUERY} huruf untuk mencari nama customer.")
+                else: st.warning("Data tidak ditemukan.")
+            except Exception as e: st.error(f"Terjadi kesalahan koneksi. {db.describe_error(e)}")
@@ -0,0 +1,140 @@
+# Halaman Dashboard Monitoring: hitungan bucket, rincian bucket, dan Analitik SLA.
+
+import pandas as pd
+import streamlit as st
+
+from datetime import datetime, timedelta
+
+import analytics
+import changefeed
+import db
+import parallel
+import status_model
+from common import repo, qcache, get_branch_list, count_shipments, fetch_bucket_rows
+
+BUCKET_PAGE_SIZE = 50
+# Label urutan -> (kolom, menurun); semua kolom punya index per bucket
+SORT_OPTIONS = {"Terbaru dibuat": ("created_at", True), "Terlama dibuat": ("created_at", False),
+                "Update terbaru": ("last_updated", True), "Update terlama": ("last_updated", False),
+                "Order ID (A-Z)": ("order_id", False)}
+
+# --- SNAPSHOT ORDER AKTIF (CHANGE FEED DARI shipment_events) ---
+@st.cache_resource
+def get_feed():
+    # Perubahan dari sesi / proses lain ikut membuang cache query cabang itu
+    return changefeed.ChangeFeed(on_change=qcache.invalidate)
+
+@st.fragment(run_every=changefeed.POLL_INTERVAL)
+def watch_changes(branch):
+    """Cek feed berkala; rerun halaman hanya bila snapshot cabang ini berubah sejak dirender."""
+    feed = get_feed()
+    feed.refresh(repo)
+    if feed.version(branch) != st.session_state.get("dash_seen"): st.rerun()
+    st.caption(f"🟢 Live · dicek {(datetime.utcnow() + timedelta(hours=7)).strftime('%H:%M:%S')} WIB")
+
+# --- ANALITIK SLA (ROLLUP INKREMENTAL DARI shipment_events) ---
+@st.cache_resource
+def get_rollups():
+    return analytics.Rollups()
+
+def fmt_hours(h):
+    if h is None: return "-"
+    return f"{h:.1f} jam" if h < 48 else f"{h / 24:.1f} hari"
+
+def render_analytics(branch, per_branch=False):
+    rollups = get_rollups()
+    rollups.refresh(repo)
+    snap = rollups.snapshot(branch)
+    c1, c2, c3, c4, c5 = st.columns(5)
+    c1.metric("🆕 Order Hari Ini", snap["orders_today"])
+    c2.metric("⏱️ Median Konfirmasi→Selesai", fmt_hours(snap["lead_p50_h"]))
+    c3.metric("⏱️ P90 Konfirmasi→Selesai", fmt_hours(snap["lead_p90_h"]))
+    c4.metric("📦 Backlog Terbuka", snap["backlog"])
+    c5.metric("⌛ Backlog Tertua", fmt_hours(snap["backlog_max_h"]))
+    st.caption(f"Dari {snap['completed']} order selesai yang tercatat di riwayat status · median umur backlog {fmt_hours(snap['backlog_p50_h'])}")
+    st.subheader("Order Baru per Hari (14 hari)")
+    st.bar_chart(pd.DataFrame(snap["orders_per_day"], columns=["Tanggal", "Order"]).set_index("Tanggal"))
+    if per_branch:
+        st.subheader("Per Cabang")
+        rows = [{"Cabang": b, "Order Hari Ini": x["orders_today"], "Selesai": x["completed"],
+                 "Median": fmt_hours(x["lead_p50_h"]), "P90": fmt_hours(x["lead_p90_h"]),
+                 "Backlog": x["backlog"], "Backlog Tertua": fmt_hours(x["backlog_max_h"])}
+                for b, x in rollups.by_branch().items()]
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+def render():
+    st.title("📊 Monitoring Operasional")
+    try:
+        if st.session_state['user_role'] in ["Sales", "SPV"]:
+            branch = st.session_state['user_branch']
+        else:
+            br_list = get_branch_list()
+            br_list.insert(0, "Semua Cabang")
+            sel_br = st.selectbox("Filter Cabang:", br_list)
+            branch = None if sel_br == "Semua Cabang" else sel_br
+
+        dash_view = st.radio("Tampilan:", ["Operasional", "Analitik SLA"], horizontal=True, key="dash_view")
+        if dash_view == "Analitik SLA":
+            render_analytics(branch, per_branch=st.session_state['user_role'] == "Admin" and branch is None)
+        else:
+            disp = ['order_id', 'customer_name', 'product_name', 'status', 'last_updated', 'delivery_type']
+            if st.session_state['user_role'] == "Admin": disp.insert(3, 'branch')
+
+            # Diproses / Sedang Jalan / badge dari snapshot change feed (tanpa query); Selesai tetap
+            # count query. Feed, count dan baris bucket yang sedang dibuka diambil paralel.
+            feed = get_feed()
+            tasks = {"live": lambda: (feed.refresh(repo), feed.counts(branch))[1],
+                     status_model.DONE: lambda: count_shipments(branch, status_model.DONE)}
+            # Filter, urutan & halaman tabel bucket dibaca dari state widget (sudah berisi nilai rerun ini)
+            open_bucket = st.session_state.get("dash_bucket", "Tutup")
+            b_q = st.session_state.get("dash_q", "").strip()
+            b_sort = st.session_state.get("dash_sort", next(iter(SORT_OPTIONS)))
+            sig = (branch, open_bucket, b_q, b_sort)
+            if st.session_state.get("dash_sig") != sig: st.session_state.update({"dash_sig": sig, "dash_page": 0})
+            b_page = st.session_state["dash_page"]
+            if open_bucket != "Tutup":
+                tasks["rows"] = lambda: fetch_bucket_rows(branch, open_bucket, disp, b_q, *SORT_OPTIONS[b_sort],
+                                                          b_page * BUCKET_PAGE_SIZE, BUCKET_PAGE_SIZE)
+                if b_q: tasks["found"] = lambda: count_shipments(branch, open_bucket, search=b_q)
+            res = parallel.fetch_all(tasks)
+            live = res["live"]
+            counts = {b: live[b] if b in live else res[b] for b in status_model.CATEGORIES}
+            st.session_state["dash_seen"] = feed.version(branch)
+            watch_changes(branch)
+
+            if sum(counts.values()) == 0:
+                st.info("📍 Belum ada data pengiriman.")
+            else:
+                # Notifikasi Badge
+                if st.session_state['user_role'] in ["SPV", "Admin"] and live["konfirmasi"]:
+                    st.error(f"🔔 PERHATIAN: Ada {live['konfirmasi']} Order Baru Menunggu Konfirmasi!", icon="🔥")
+
+                c1, c2, c3 = st.columns(3)
+                c1.metric("📦 Diproses", counts["pending"])
+                c2.metric("🚚 Sedang Jalan", counts["shipping"])
+                c3.metric("✅ Selesai", counts["done"])
+                st.divider()
+
+                # Baris hanya diambil untuk bucket yang sedang dibuka, satu halaman per query
+                labels = {"Tutup": "Tutup", "pending": f"📦 Diproses Gudang ({counts['pending']})",
+                          "shipping": f"🚚 Sedang Jalan ({counts['shipping']})", "done": f"✅ Selesai ({counts['done']})"}
+                sel_bucket = st.radio("Lihat Rincian:", list(labels.keys()), format_func=labels.get, horizontal=True, key="dash_bucket")
+                if sel_bucket != "Tutup":
+                    f1, f2 = st.columns([2, 1])
+                    f1.text_input("Cari Order ID / Nama:", key="dash_q")
+                    f2.selectbox("Urutkan:", list(SORT_OPTIONS), key="dash_sort")
+                    rows = res["rows"] if sel_bucket == open_bucket else fetch_bucket_rows(
+                        branch, sel_bucket, disp, b_q, *SORT_OPTIONS[b_sort], 0, BUCKET_PAGE_SIZE)
+                    total = res.get("found", counts[sel_bucket])
+                    n_pages = max(1, -(-total // BUCKET_PAGE_SIZE))
+                    first = b_page * BUCKET_PAGE_SIZE
+                    st.caption(f"{first + 1 if rows else 0}–{first + len(rows)} dari {total} order · halaman {b_page + 1}/{n_pages}")
+                    df = pd.DataFrame(rows, columns=disp)
+                    if 'last_updated' in df.columns: df['last_updated'] = pd.to_datetime(df['last_updated'], errors='coerce').dt.strftime('%d/%m/%Y %H:%M').fillna('-')
+                    st.dataframe(df, use_container_width=True, hide_index=True)
+                    p1, _, p2 = st.columns([1, 2, 1])
+                    p1.button("⬅️ Sebelumnya", key="dash_prev", disabled=b_page == 0,
+                              on_click=lambda: st.session_state.update({"dash_page": b_page - 1}))
+                    p2.button("Berikutnya ➡️", key="dash_next", disabled=b_page + 1 >= n_pages,
+                              on_click=lambda: st.session_state.update({"dash_page": b_page + 1}))
+    except Exception as e: st.error(db.describe_error(e))
@@ -0,0 +1,199 @@
+# Halaman Input Delivery Order (khusus Sales): input satuan + upload massal CSV/Excel.
+
+from datetime import datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+
+import db
+import orders
+import repository
+import surat_jalan
+from common import QR_BASE_URL, repo, qcache, pdf_cache, outbox
+
+# --- FUNGSI CETAK PDF (Thermal 80mm) ---
+def create_thermal_pdf(data, print_timestamp):
+    return surat_jalan.create_thermal_pdf(data, print_timestamp, QR_BASE_URL)
+
+def note_pdf(data, print_timestamp=None):
+    """PDF Surat Jalan dari PdfCache; dirender (waktu cetak = sekarang) bila belum ada / isi order berubah."""
+    key = (data['order_id'], surat_jalan.note_hash(data))
+    return pdf_cache.get_or_render(key, lambda: create_thermal_pdf(data, print_timestamp or datetime.utcnow() + timedelta(hours=7)))
+
+def find_order(order_id):
+    # Cetak ulang juga untuk order yang sudah diarsipkan / masih di antrean outbox
+    cols = surat_jalan.NOTE_FIELDS + ['status']
+    return repo.get(order_id, cols) or repo.get(order_id, cols, archived=True) or outbox.get(order_id)
+
+# --- CALLBACK SALES SUBMIT ---
+def process_sales_submit():
+    st.session_state['sales_success'] = False
+    st.session_state['sales_error'] = None
+    s = st.session_state
+    
+    in_id = s.get("in_id", "").strip()
+    in_sales = s.get("in_sales", "")
+    in_sales_hp = s.get("in_sales_hp", "")
+    in_nama = s.get("in_nama", "")
+    in_hp = s.get("in_hp", "")
+    in_alamat = s.get("in_alamat", "")
+    in_barang = s.get("in_barang", "")
+    in_tipe = s.get("in_tipe", "Reguler")
+    branch = s.get("user_branch", "")
+    
+    in_old_item = s.get("in_barang_lama", "") if in_tipe == "Tukar Tambah" else ""
+    in_inst = s.get("in_instalasi", "Tidak")
+    in_fee = s.get("in_biaya_inst", "") if in_inst == "Ya - Vendor" else ""
+    
+    # Waktu WIB (+7)
+    TIME_OFFSET = timedelta(hours=7) 
+    current_time_wib = datetime.utcnow() + TIME_OFFSET 
+
+    payload = orders.build_payload(in_id, in_sales, in_sales_hp, in_nama, in_hp, in_alamat, in_barang,
+                                   in_tipe, branch, in_old_item, in_inst, in_fee, current_time_wib)
+    err = orders.validate_order(payload)
+    if err:
+        st.session_state['sales_error'] = err
+        return
+
+    try:
+        # Masuk antrean lokal dulu; thread flusher yang mengirim ke database. Order ID bentrok tidak dicek
+        # di sini (panggilan server bisa menggantung submit); flusher menaruhnya di daftar gagal terkirim
+        outbox.enqueue(payload)
+        
+        note_pdf(payload, current_time_wib)
+        st.session_state['sales_pdf_order'] = payload
+        st.session_state['sales_success'] = True
+        st.session_state['sales_last_id'] = in_id
+        
+        # Reset Data Input
+        for k in ["in_id", "in_sales", "in_sales_hp", "in_nama", "in_hp", "in_alamat", "in_barang", "in_biaya_inst", "in_barang_lama"]:
+            st.session_state[k] = ""
+        st.session_state["in_tipe"] = "Reguler"
+        st.session_state["in_instalasi"] = "Tidak"
+        
+    except repository.DuplicateOrderError:
+        st.session_state['sales_error'] = f"⛔ Order ID **{in_id}** sudah ada di antrean."
+    except Exception as e:
+        st.session_state['sales_error'] = f"Error: {db.describe_error(e)}"
+
+def render_outbox(branch):
+    q = outbox.depth(branch)
+    if q['pending']: st.caption(f"📮 {q['pending']} order menunggu terkirim ke server (dikirim otomatis).")
+    if not q['failed']: return
+    with st.expander(f"⚠️ {q['failed']} order gagal terkirim", expanded=True):
+        for r in outbox.rows(branch, 'failed'):
+            c1, c2, c3 = st.columns([4, 1, 1])
+            c1.write(f"**{r['order_id']}** — {r['last_error']}")
+            if c2.button("Kirim Ulang", key=f"ob_retry_{r['order_id']}"): outbox.retry(r['order_id']); st.rerun()
+            if c3.button("Buang", key=f"ob_drop_{r['order_id']}"): outbox.discard(r['order_id']); st.rerun()
+
+def render():
+    if st.session_state['user_role'] != "Sales": st.error("Akses Ditolak."); st.stop()
+    st.title("📝 Input Delivery Order")
+    branch = st.session_state['user_branch']
+    st.info(f"Cabang: **{branch}**")
+    render_outbox(branch)
+
+    tab_one, tab_bulk, tab_reprint = st.tabs(["📝 Input Satuan", "📤 Upload Massal (CSV/Excel)", "🖨️ Cetak Ulang"])
+
+    with tab_one:
+        if st.session_state.get('sales_success'):
+            st.success(f"✅ Order {st.session_state.get('sales_last_id')} Berhasil Disimpan!")
+            last = st.session_state.get('sales_pdf_order')
+            if last:
+                st.download_button("DOWNLOAD SURAT JALAN (PDF 80mm)", note_pdf(last), f"SJ_{last['order_id']}.pdf",
+                                   mime="application/pdf", type="primary", use_container_width=True)
+            st.divider()
+            if st.button("Selesai / Buat Baru"): st.session_state['sales_success'] = False; st.session_state.pop('sales_pdf_order', None); st.rerun()
+        else:
+            if st.session_state.get('sales_error'): st.error(st.session_state['sales_error'])
+            with st.container(border=True):
+                st.subheader("1. Data Sales & Order")
+                st.text_input("Order ID (Wajib)", key="in_id")
+                c1, c2 = st.columns(2)
+                c1.text_input("Nama Sales", key="in_sales")
+                c2.text_input("No WA Sales", key="in_sales_hp")
+                st.divider()
+
+                st.subheader("2. Data Pelanggan")
+                c3, c4 = st.columns(2)
+                c3.text_input("Nama Customer", key="in_nama")
+                c4.text_input("No HP Customer", key="in_hp")
+                st.text_area("Alamat Pengiriman", key="in_alamat")
+                st.divider()
+
+                st.subheader("3. Detail Barang & Layanan")
+                c5, c6 = st.columns(2)
+                c5.text_input("Nama Barang", key="in_barang")
+                tp = st.selectbox("Tipe Pengiriman", ["Reguler", "Tukar Tambah", "Express"], key="in_tipe")
+                if tp == "Tukar Tambah":
+                    st.info("🔄 Mode Tukar Tambah Aktif")
+                    st.text_input("Detail Barang Lama (Wajib)", key="in_barang_lama", placeholder="Merk, Tipe, Kondisi...")
+
+                c7, c8 = st.columns(2)
+                sel_inst = st.selectbox("Opsi Instalasi?", ["Tidak", "Ya - Vendor"], key="in_instalasi")
+                if sel_inst == "Ya - Vendor":
+                    st.info("🔧 Mode Instalasi Vendor Aktif")
+                    st.text_input("Biaya Transport (Rp)", key="in_biaya_inst")
+
+                st.divider()
+                st.button("Kirim ke Gudang", type="primary", on_click=process_sales_submit)
+
+    with tab_bulk:
+        st.caption("Satu baris = satu order. Kolom wajib: order_id, sales_name, customer_name, product_name "
+                   "(old_product_name wajib untuk Tukar Tambah).")
+        tmpl = ",".join(orders.IMPORT_COLUMNS) + "\nSO-001,Nama Sales,0812,Nama Customer,0813,Alamat,Nama Barang,Reguler,,Tidak,\n"
+        st.download_button("Download Template (.csv)", tmpl, "Template_Upload_Order.csv", mime="text/csv")
+        up = st.file_uploader("File Order:", type=["csv", "xlsx"], key="bulk_file")
+        if up is not None:
+            try:
+                if up.name.lower().endswith(".csv"): df_up = pd.read_csv(up, dtype=str, keep_default_na=False)
+                else: df_up = pd.read_excel(up, dtype=str, keep_default_na=False)
+            except Exception as e:
+                st.error(f"File tidak bisa dibaca: {e}"); st.stop()
+            df_up.columns = [str(c).strip().lower() for c in df_up.columns]
+            missing = [c for c in ["order_id", "sales_name", "customer_name", "product_name"] if c not in df_up.columns]
+            if missing: st.error(f"Kolom wajib tidak ada: {', '.join(missing)}"); st.stop()
+            st.info(f"{len(df_up)} baris terbaca.")
+            st.dataframe(df_up.head(20), use_container_width=True, hide_index=True)
+
+            if st.button("Validasi & Simpan Semua", type="primary"):
+                now_wib = datetime.utcnow() + timedelta(hours=7)
+                with st.spinner("Menyimpan order..."):
+                    inserted, errors = orders.import_orders(repo, df_up.to_dict("records"), branch, now_wib)
+                if inserted: qcache.invalidate(branch)
+                st.session_state['bulk_result'] = {'inserted': inserted, 'errors': errors, 'ts': now_wib}
+                st.session_state.pop('bulk_pdf', None)
+
+        res_bulk = st.session_state.get('bulk_result')
+        if res_bulk:
+            st.success(f"✅ {len(res_bulk['inserted'])} order tersimpan.")
+            if res_bulk['errors']:
+                st.error(f"⚠️ {len(res_bulk['errors'])} baris gagal, baris lain tetap disimpan:")
+                st.dataframe(pd.DataFrame(res_bulk['errors']), use_container_width=True, hide_index=True)
+            if res_bulk['inserted']:
+                # PDF batch dirender sekali saat diminta, bukan di setiap rerun halaman
+                ids = tuple(d['order_id'] for d in res_bulk['inserted'])
+                built = st.session_state.get('bulk_pdf')
+                if not built or built['ids'] != ids:
+                    if st.button("Buat Surat Jalan"):
+                        with st.spinner("Menyusun Surat Jalan..."):
+                            built = {'ids': ids, 'pdf': surat_jalan.create_batch_pdf(res_bulk['inserted'], res_bulk['ts'], QR_BASE_URL)}
+                        st.session_state['bulk_pdf'] = built
+                    else: built = None
+                if built:
+                    st.download_button("DOWNLOAD SURAT JALAN (PDF Batch)", built['pdf'], f"SJ_Upload_{res_bulk['ts'].strftime('%Y%m%d_%H%M')}.pdf", mime="application/pdf")
+
+    with tab_reprint:
+        st.caption("Cetak ulang Surat Jalan order cabang ini tanpa input ulang.")
+        rp_id = st.text_input("Order ID:", key="reprint_id").strip()
+        if rp_id:
+            try:
+                d = find_order(rp_id)
+                if not d or d.get('branch') != branch: st.warning("Order tidak ditemukan di cabang ini.")
+                else:
+                    st.info(f"{d['order_id']} · {d['customer_name']} · {d['product_name']} · {d['status']}")
+                    # PDF baru dirender (atau diambil dari cache) saat tombol diklik, bukan setiap Order ID diketik
+                    st.download_button("🖨️ Cetak Ulang Surat Jalan", lambda d=d: note_pdf(d), f"SJ_{d['order_id']}.pdf", mime="application/pdf")
+            except Exception as e: st.error(db.describe_error(e))
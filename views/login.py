@@ -0,0 +1,50 @@
+# Halaman Login Staff (gatekeeper + login per peran).
+
+import time
+
+import streamlit as st
+
+from common import ADMIN_PASSWORD, GATEKEEPER_PASSWORD, SALES_CREDENTIALS, SPV_CREDENTIALS
+
+def render():
+    st.title("🔐 Login Staff & Admin")
+
+    if not st.session_state.get("gate_unlocked"):
+        c_pin1, c_pin2, c_pin3 = st.columns([1,2,1])
+        with c_pin2:
+            st.info("🔒 Masukkan Kode Akses Internal")
+            gate_pin = st.text_input("Kode Akses:", type="password", key="gate_pin")
+            if st.button("Buka Akses"):
+                if gate_pin == GATEKEEPER_PASSWORD:
+                    st.session_state["gate_unlocked"] = True
+                    st.toast("Akses Diterima.", icon="🔓")
+                    time.sleep(0.5)
+                    st.rerun()
+                else:
+                    st.error("Kode Akses Salah.")
+        st.stop()
+
+    st.success("Akses Terbuka. Silakan Login.")
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        with st.container(border=True):
+            tp = st.radio("Pilih Tipe Akun:", ["Sales Cabang", "SPV Cabang", "Admin Pusat"], horizontal=True)
+            st.divider()
+            if tp == "Sales Cabang":
+                cb = st.selectbox("Cabang:", list(SALES_CREDENTIALS.keys()))
+                pw = st.text_input("Password Sales:", type="password")
+                if st.button("Masuk Sales", use_container_width=True):
+                    if pw == SALES_CREDENTIALS.get(cb): st.session_state.update({'user_role': "Sales", 'user_branch': cb}); st.rerun()
+                    else: st.error("Salah!")
+            elif tp == "SPV Cabang":
+                cb = st.selectbox("Cabang:", list(SPV_CREDENTIALS.keys()))
+                pw = st.text_input("Password SPV:", type="password")
+                if st.button("Masuk SPV", use_container_width=True):
+                    if pw == SPV_CREDENTIALS.get(cb): st.session_state.update({'user_role': "SPV", 'user_branch': cb}); st.rerun()
+                    else: st.error("Salah!")
+            else:
+                pw = st.text_input("Password Admin:", type="password")
+                if st.button("Masuk Admin", use_container_width=True):
+                    if pw == ADMIN_PASSWORD: st.session_state.update({'user_role': "Admin", 'user_branch': "Pusat"}); st.rerun()
+                    else: st.error("Salah!")
@@ -0,0 +1,133 @@
+# Halaman Manajemen Data: export, cetak batch Surat Jalan, hapus, arsip, reset.
+
+import os
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+import archive
+import export
+import orders
+import surat_jalan
+from cache import ALL_BRANCHES
+from common import QR_BASE_URL, repo, qcache, cached, get_branch_list
+
+# Daftar order cukup kolom ringkas; isi Surat Jalan diambil saat tombol cetak ditekan
+LIST_COLS = ['order_id', 'customer_name', 'status', 'branch']
+PAGE_SIZE = 50
+
+def order_page(prefix, branch, status=None):
+    """Satu halaman order (keyset ``repo.page`` + cari di server) dengan tombol sebelum/berikutnya."""
+    q = st.text_input("Cari Order ID / Nama:", key=f"{prefix}_q").strip()
+    # Riwayat cursor halaman; reset bila filter berubah
+    sig = (branch, q, status)
+    if st.session_state.get(f"{prefix}_sig") != sig:
+        st.session_state.update({f"{prefix}_sig": sig, f"{prefix}_cursors": [None]})
+    cursors = st.session_state[f"{prefix}_cursors"]
+    cursor = cursors[-1]
+    rows, next_cursor = cached("mgmt_page", lambda: repo.page(branch, q, status, cursor, PAGE_SIZE, LIST_COLS),
+                               branch, status, q, cursor)
+    n1, n2, n3 = st.columns([1, 2, 1])
+    if len(cursors) > 1 and n1.button("⬅️ Sebelumnya", key=f"{prefix}_prev"):
+        cursors.pop(); st.rerun()
+    n2.caption(f"Halaman {len(cursors)} · {len(rows)} order")
+    if next_cursor and n3.button("Berikutnya ➡️", key=f"{prefix}_next"):
+        cursors.append(next_cursor); st.rerun()
+    if not rows: st.info("📍 Tidak ada order sesuai filter.")
+    return rows
+
+def render():
+    st.title("🗄️ Manajemen Data")
+    mgmt_branch = st.session_state['user_branch'] if st.session_state['user_role'] == "SPV" else ALL_BRANCHES
+    # RESTORED: Nama Tab Lengkap & Jelas
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📥 Download Excel", "🖨️ Cetak Surat Jalan", "🗑️ Hapus Order", "📦 Arsip", "🔥 Reset Database"])
+
+    with tab1:
+        st.subheader("Laporan Bulanan")
+        # File hanya dibuat saat diminta, diambil bertahap dari database
+        with st.form("export_form"):
+            today = (datetime.utcnow() + timedelta(hours=7)).date()
+            rng = st.date_input("Rentang Tanggal Order:", value=(today.replace(day=1), today))
+            if st.session_state['user_role'] == "Admin":
+                exp_br = st.selectbox("Cabang:", ["Semua Cabang"] + get_branch_list())
+                exp_br = None if exp_br == "Semua Cabang" else exp_br
+            else: exp_br = mgmt_branch
+            exp_fmt = st.radio("Format:", ["Excel (.xlsx)", "CSV (.csv)"], horizontal=True)
+            exp_arc = st.checkbox("Sertakan order arsip (selesai > beberapa bulan)")
+            go_export = st.form_submit_button("Siapkan File Laporan")
+
+        if go_export:
+            d_start, d_end = (rng[0], rng[-1]) if rng else (None, None)
+            fmt = "xlsx" if exp_fmt.startswith("Excel") else "csv"
+            old = st.session_state.pop('export_file', None)
+            if old and os.path.exists(old['path']): os.unlink(old['path'])
+            with st.spinner("Menyusun laporan..."):
+                path, n_rows = export.export_to_file(repo, fmt, exp_br, d_start, d_end, include_archive=exp_arc)
+            st.session_state['export_file'] = {'path': path, 'rows': n_rows, 'fmt': fmt,
+                                               'name': f"Laporan_Delivery_{d_start or ''}_{d_end or ''}.{fmt}"}
+
+        exp = st.session_state.get('export_file')
+        if exp and os.path.exists(exp['path']):
+            st.caption(f"{exp['rows']} baris siap diunduh.")
+            mime = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet" if exp['fmt'] == "xlsx" else "text/csv"
+            # File baru dibaca saat tombol diklik, bukan dimuat ke memori di setiap rerun
+            st.download_button(f"Download Laporan (.{exp['fmt']})", lambda path=exp['path']: export.read_file(path), exp['name'], mime=mime)
+
+    with tab2:
+        st.subheader("Cetak Batch")
+        st.caption("Semua Surat Jalan terpilih digabung dalam satu PDF (satu halaman 80mm per order).")
+        f_stat = st.selectbox("Filter Status:", ["Semua Status"] + orders.STATUS_OPTIONS, key="prn_stat")
+        prn_rows = order_page("prn", mgmt_branch, None if f_stat == "Semua Status" else f_stat)
+        # Pilihan dibawa antar halaman: order terpilih tetap jadi opsi walau tidak ada di halaman ini
+        opts = list(dict.fromkeys(st.session_state.get("prn_sel", []) + [d['order_id'] for d in prn_rows]))
+        labels = {o: t for o, t in st.session_state.get("prn_labels", {}).items() if o in opts}
+        labels.update({d['order_id']: f"{d['order_id']} - {d['customer_name']}" for d in prn_rows})
+        st.session_state["prn_labels"] = labels
+        # Tidak ada pilihan awal: semua order bisa ratusan halaman PDF, jadi harus dipilih eksplisit
+        if prn_rows and st.button(f"Pilih semua {len(prn_rows)} order di halaman ini"): st.session_state["prn_sel"] = opts
+        sel_prn = st.multiselect("Pilih Order:", opts, key="prn_sel", format_func=lambda o: labels.get(o, o),
+                                 placeholder="Pilih order (bisa dari beberapa halaman)...")
+        if sel_prn and st.button(f"Cetak {len(sel_prn)} Surat Jalan"):
+            ts_now = datetime.utcnow() + timedelta(hours=7)
+            with st.spinner("Menyusun PDF..."):
+                notes = repo.get_many(sel_prn, surat_jalan.NOTE_FIELDS)
+                pdf_batch = surat_jalan.create_batch_pdf(notes, ts_now, QR_BASE_URL)
+            st.download_button("Download PDF Batch", pdf_batch, f"SJ_Batch_{ts_now.strftime('%Y%m%d_%H%M')}.pdf", mime="application/pdf")
+
+    with tab3:
+        st.subheader("Hapus Satuan")
+        del_o = {f"{d['order_id']} - {d['customer_name']}": d for d in order_page("del", mgmt_branch)}
+        s = st.selectbox("Pilih ID:", list(del_o.keys()), index=None)
+        if s and st.button("Hapus Permanen"): 
+            repo.delete(del_o[s]['order_id'])
+            qcache.invalidate(del_o[s].get('branch')); st.rerun()
+
+    with tab4:
+        st.subheader("Arsip Order Selesai")
+        if st.session_state['user_role'] == "Admin":
+            if "archive_msg" in st.session_state: st.success(st.session_state.pop("archive_msg"))
+            st.caption("Order selesai yang sudah lama dipindah ke tabel arsip. Dashboard & Update Status hanya membaca order aktif; Cek Resi dan export (opsional) tetap menemukan order arsip.")
+            # Hitung tabel penuh hanya bila diminta, bukan di setiap render halaman
+            if st.button("Hitung Jumlah Order"): st.session_state["archive_counts"] = (repo.count(), repo.count_archive())
+            counts = st.session_state.get("archive_counts")
+            if counts:
+                a1, a2 = st.columns(2)
+                a1.metric("Order Aktif", counts[0])
+                a2.metric("Order Arsip", counts[1])
+            with st.form("archive_form"):
+                arc_days = st.number_input("Arsipkan order selesai lebih dari (hari):", min_value=1, value=archive.ARCHIVE_AFTER_DAYS)
+                go_arc = st.form_submit_button("Arsipkan Sekarang")
+            if go_arc:
+                bar = st.empty()
+                moved = archive.run(repo, int(arc_days), progress=lambda m: bar.caption(f"{m} order dipindah..."))
+                qcache.invalidate()
+                st.session_state.pop("archive_counts", None)
+                st.session_state["archive_msg"] = f"✅ {moved} order dipindah ke arsip."; st.rerun()
+        else: st.warning("Akses Khusus Admin Pusat.")
+
+    with tab5:
+        st.subheader("Reset Total")
+        if st.session_state['user_role'] == "Admin":
+            if st.text_input("Ketik 'HAPUS SEMUA':") == "HAPUS SEMUA":
+                if st.button("🔴 RESET DATABASE"): repo.delete_all(); qcache.invalidate(); st.rerun()
+        else: st.warning("Akses Khusus Admin Pusat.")
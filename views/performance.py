@@ -0,0 +1,42 @@
+# Halaman Performance (Admin): ringkasan latency dari perf.BUFFER + statistik cache & koneksi.
+
+import pandas as pd
+import streamlit as st
+
+import db
+import perf
+from common import qcache, pdf_cache, outbox
+
+def render():
+    st.title("📈 Performance")
+    st.caption(f"Sampel latency proses ini ({len(perf.BUFFER)} dari maks. {perf.BUFFER.maxlen} terakhir). Log JSON: {'aktif' if perf.JSON_LOGS else 'nonaktif'}.")
+    kinds = {"Semua": None, "Halaman (rerun)": "page", "Query Database": "db", "Render PDF": "pdf", "Export": "export"}
+    pk = st.radio("Jenis:", list(kinds.keys()), horizontal=True)
+    summ = perf.BUFFER.summary(kinds[pk])
+    if summ: st.dataframe(pd.DataFrame(summ), use_container_width=True, hide_index=True)
+    else: st.info("Belum ada sampel.")
+
+    samples = perf.BUFFER.samples()
+    if kinds[pk]: samples = [x for x in samples if x["kind"] == kinds[pk]]
+    if samples:
+        st.subheader("20 Sampel Terlambat")
+        slow = sorted(samples, key=lambda x: x["ms"], reverse=True)[:20]
+        df_slow = pd.DataFrame(slow)
+        df_slow["ts"] = pd.to_datetime(df_slow["ts"], unit="s") + pd.Timedelta(hours=7)
+        df_slow["ms"] = df_slow["ms"].round(1)
+        st.dataframe(df_slow[["ts", "kind", "name", "ms", "rows", "ok"]], use_container_width=True, hide_index=True)
+
+    c1, c2, c3, c4 = st.columns(4)
+    with c1:
+        with st.expander("🗃️ Cache Query"): st.json(qcache.stats())
+    with c2:
+        with st.expander("🧾 Cache PDF"): st.json(pdf_cache.stats())
+    with c3:
+        with st.expander("📡 Koneksi Database"): st.dataframe(db.STATS.summary(), hide_index=True)
+    with c4:
+        ob = outbox.stats()
+        with st.expander(f"📮 Outbox ({ob['pending']} antre, {ob['failed']} gagal)"):
+            st.json(ob)
+            failed = outbox.rows(state='failed')
+            if failed: st.dataframe(pd.DataFrame(failed), use_container_width=True, hide_index=True)
+    if st.button("Reset Sampel"): perf.BUFFER.clear(); db.STATS.reset(); st.rerun()
@@ -0,0 +1,168 @@
+# Halaman Update Status (SPV & Admin): satu order atau massal.
+
+from datetime import datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+import streamlit.components.v1 as components
+
+import db
+import orders
+import parallel
+import status_model
+from cache import ALL_BRANCHES
+from common import repo, qcache, cached
+
+BULK_LIST_LIMIT = 500  # batas baris tabel update massal
+# Picker cukup kolom label; detail (form) hanya diambil untuk order yang dipilih
+PICKER_COLS = ['order_id', 'customer_name', 'status']
+DETAIL_COLS = ['order_id', 'branch', 'status', 'status_code', 'courier', 'resi', 'customer_name', 'product_name']
+
+# --- CALLBACK ADMIN UPDATE ---
+def process_admin_update(oid, branch=ALL_BRANCHES):
+    new_stat = st.session_state.get(f"stat_{oid}")
+    new_kurir = st.session_state.get(f"kur_{oid}")
+    new_resi = st.session_state.get(f"res_{oid}")
+    d_date = st.session_state.get(f"date_{oid}")
+    d_time = st.session_state.get(f"time_{oid}")
+    corr_nama = st.session_state.get(f"cnama_{oid}")
+    corr_barang = st.session_state.get(f"cbar_{oid}")
+    
+    final_dt = datetime.combine(d_date, d_time).isoformat()
+    upd = {
+        **status_model.status_fields(new_stat), "courier": new_kurir, "resi": new_resi,
+        "last_updated": final_dt, "customer_name": corr_nama, "product_name": corr_barang
+    }
+    
+    try:
+        repo.update(oid, upd)
+        qcache.invalidate(branch)
+        st.success("✅ Data Berhasil Diupdate!") # NOTIFIKASI SUKSES PERSISTEN
+        st.toast("Data Terupdate!", icon="✅")
+        st.session_state["upd_sel"] = None
+    except Exception as e:
+        st.toast(f"Error: {db.describe_error(e)}", icon="❌")
+
+# --- CALLBACK UPDATE MASSAL ---
+def process_bulk_update(branch=ALL_BRANCHES):
+    ids = st.session_state.get("bulk_ids") or []
+    if not ids:
+        st.session_state["bulk_upd_result"] = {"updated": [], "failed": {}, "error": "⚠️ Belum ada order yang dipilih."}
+        return
+    d_date = st.session_state.get("bulk_date")
+    d_time = st.session_state.get("bulk_time")
+    upd = {**status_model.status_fields(st.session_state.get("bulk_stat")), "last_updated": datetime.combine(d_date, d_time).isoformat()}
+    kurir = st.session_state.get("bulk_kur", "").strip()
+    if kurir: upd["courier"] = kurir  # kosong = kurir lama tidak ditimpa
+
+    updated, failed = orders.bulk_update(repo, ids, upd)
+    if updated: qcache.invalidate(branch)
+    st.session_state["bulk_upd_result"] = {"updated": updated, "failed": failed, "error": None}
+
+def render():
+    st.title("⚙️ Validasi Order")
+
+    if "admin_success_msg" in st.session_state:
+        st.success(st.session_state["admin_success_msg"])
+        del st.session_state["admin_success_msg"]
+
+    upd_branch = st.session_state['user_branch'] if st.session_state['user_role'] == "SPV" else ALL_BRANCHES
+    upd_mode = st.radio("Mode:", ["Satu Order", "Massal"], horizontal=True, key="upd_mode")
+
+    if upd_mode == "Massal":
+        res_bulk = st.session_state.pop("bulk_upd_result", None)
+        if res_bulk:
+            if res_bulk["error"]: st.warning(res_bulk["error"])
+            if res_bulk["updated"]: st.success(f"✅ {len(res_bulk['updated'])} order berhasil diupdate.")
+            if res_bulk["failed"]:
+                st.error(f"⚠️ {len(res_bulk['failed'])} order gagal diupdate:")
+                st.dataframe(pd.DataFrame([{"order_id": k, "error": v} for k, v in res_bulk["failed"].items()]), use_container_width=True, hide_index=True)
+
+        f1, f2 = st.columns([2, 1])
+        f_stat = f1.multiselect("Filter Status:", orders.STATUS_OPTIONS, default=orders.STATUS_OPTIONS[:3])
+        f_q = f2.text_input("Cari Order ID / Nama:").strip().lower()
+        bulk_cols = ['order_id', 'customer_name', 'product_name', 'status', 'courier', 'branch', 'created_at']
+        rows = cached("bulk_list", lambda: repo.list_recent(upd_branch, f_stat, bulk_cols, BULK_LIST_LIMIT), upd_branch, term="|".join(f_stat), page=0)
+        if f_q: rows = [d for d in rows if f_q in str(d.get('order_id', '')).lower() or f_q in str(d.get('customer_name', '')).lower()]
+
+        if not rows: st.info("📍 Tidak ada order sesuai filter.")
+        else:
+            pick_all = st.checkbox("Pilih semua yang tampil")
+            df_bulk = pd.DataFrame(rows, columns=bulk_cols)
+            df_bulk.insert(0, "pilih", pick_all)
+            edited = st.data_editor(df_bulk, hide_index=True, use_container_width=True, disabled=bulk_cols,
+                                    key=f"bulk_editor_{'|'.join(f_stat)}_{f_q}_{pick_all}")
+            st.session_state["bulk_ids"] = edited.loc[edited["pilih"], "order_id"].tolist()
+            st.caption(f"{len(st.session_state['bulk_ids'])} order dipilih.")
+
+            with st.form("bulk_form"):
+                st.selectbox("Status Baru", orders.STATUS_OPTIONS, index=3, key="bulk_stat")
+                st.text_input("Kurir (kosongkan jika tidak diubah)", key="bulk_kur")
+                wib_now = datetime.utcnow() + timedelta(hours=7)
+                st.write("**Waktu Fakta Lapangan:**")
+                st.date_input("Tanggal", value=wib_now.date(), key="bulk_date")
+                st.time_input("Jam (WIB)", value=wib_now.time(), key="bulk_time")
+                st.form_submit_button("Update Order Terpilih", on_click=process_bulk_update, args=(upd_branch,))
+    else:
+        p1, p2 = st.columns([2, 1])
+        p_q = p1.text_input("Cari Order ID / Nama:", key="pick_q").strip()
+        p_stat = p2.selectbox("Status:", ["Semua Status"] + orders.STATUS_OPTIONS, key="pick_stat")
+        p_stat = None if p_stat == "Semua Status" else p_stat
+
+        # Riwayat cursor halaman; reset bila filter berubah
+        sig = (upd_branch, p_q, p_stat)
+        if st.session_state.get("pick_sig") != sig:
+            st.session_state.update({"pick_sig": sig, "pick_cursors": [None], "upd_sel": None})
+        cursors = st.session_state["pick_cursors"]
+        cursor = cursors[-1]
+        # Daftar halaman + detail terbaru order yang sedang dipilih, diambil paralel
+        sel_oid = st.session_state.get("upd_sel")
+        tasks = {"page": lambda: cached("picker", lambda: repo.page(upd_branch, p_q, p_stat, cursor, columns=PICKER_COLS),
+                                        upd_branch, p_stat, p_q, cursor)}
+        if sel_oid: tasks["detail"] = lambda: repo.get(sel_oid, DETAIL_COLS)
+        res = parallel.fetch_all(tasks)
+        latest, next_cursor = res["page"]
+
+        n1, n2, n3 = st.columns([1, 2, 1])
+        if len(cursors) > 1 and n1.button("⬅️ Sebelumnya"):
+            cursors.pop(); st.session_state["upd_sel"] = None; st.rerun()
+        n2.caption(f"Halaman {len(cursors)} · {len(latest)} order")
+        if next_cursor and n3.button("Berikutnya ➡️"):
+            cursors.append(next_cursor); st.session_state["upd_sel"] = None; st.rerun()
+
+        if latest:
+            opts = {d['order_id']: d for d in latest}
+            if sel_oid and sel_oid not in opts: st.session_state["upd_sel"] = sel_oid = None
+            sel = st.selectbox("Pilih Order:", list(opts.keys()), index=None, key="upd_sel",
+                               format_func=lambda o: f"[{opts[o]['status']}] {o} - {opts[o]['customer_name']}")
+
+            # Detail selalu dari query terbaru (cache daftar bisa tertinggal sampai CACHE_TTL)
+            curr = res.get("detail") if sel and sel == sel_oid else None
+            if sel and not curr: st.warning("Order tidak ditemukan, mungkin baru dihapus.")
+            if curr:
+                oid = curr['order_id']
+                # RESTORED: Tracking BES (Scrollable)
+                with st.expander("🌍 Tracking Website PT. BES"): 
+                    st.caption("Cek resi langsung:")
+                    components.iframe("https://www.bes-paket.com/track-package", height=500, scrolling=True)
+
+                with st.form("upd_form"):
+                    sts = orders.STATUS_OPTIONS
+                    st.selectbox("Status", sts, index=status_model.option_index(curr), key=f"stat_{oid}")
+                    st.text_input("Kurir", value=curr['courier'] or "", key=f"kur_{oid}")
+                    st.text_input("Resi", value=curr['resi'] or "", key=f"res_{oid}")
+                    st.divider()
+
+                    # FIX TIMEZONE: Defaultnya sekarang WIB (UTC+7)
+                    utc_now = datetime.utcnow()
+                    wib_now = utc_now + timedelta(hours=7)
+
+                    st.write("**Waktu Fakta Lapangan:**")
+                    st.date_input("Tanggal", value=wib_now.date(), key=f"date_{oid}")
+                    st.time_input("Jam (WIB)", value=wib_now.time(), key=f"time_{oid}")
+                    st.divider()
+                    st.caption("Koreksi Data:")
+                    st.text_input("Nama Customer", value=curr['customer_name'], key=f"cnama_{oid}")
+                    st.text_input("Nama Barang", value=curr['product_name'], key=f"cbar_{oid}")
+                    st.form_submit_button("Simpan Perubahan", on_click=process_admin_update, args=(oid, curr.get('branch')))
+        else: st.info("📍 Tidak ada order sesuai pencarian." if p_q or p_stat else "📍 Belum ada order baru.")